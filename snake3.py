@@ -1,13 +1,46 @@
 import pygame
+import functools
 import random
+import re
 import imageio
-from collections import deque
+import numpy as np
 
 # Constants
 WIDTH, HEIGHT = 400, 400
 GRID_SIZE = 20
+COLS, ROWS = WIDTH // GRID_SIZE, HEIGHT // GRID_SIZE
 WHITE, BLACK, BLUE, GREEN, RED, GRAY = (255, 255, 255), (0, 0, 0), (0, 0, 255), (0, 255, 0), (255, 0, 0), (200, 200, 200)
 DIRECTIONS = {'UP': (0, -1), 'DOWN': (0, 1), 'LEFT': (-1, 0), 'RIGHT': (1, 0)}
+_TRIPLE = re.compile(r"\s*\(?\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\)?\s*")
+_PAIR = re.compile(r"\s*\(?\s*(\d+)\s*,\s*(\d+)\s*\)?\s*")
+
+def parse_ints(pattern, text):
+    match = pattern.fullmatch(text)
+    return tuple(int(g) for g in match.groups()) if match else None
+
+# The board as a bitboard: cell (col, row) is bit row * COLS + col of a Python int
+BOARD_MASK = (1 << (COLS * ROWS)) - 1
+FIRST_COLUMN = sum(1 << (row * COLS) for row in range(ROWS))
+LAST_COLUMN = FIRST_COLUMN << (COLS - 1)
+
+def cell_bit(pos):
+    return 1 << ((pos[1] // GRID_SIZE) * COLS + pos[0] // GRID_SIZE)
+
+def _step_mask(dx):
+    # Cells a horizontal shift can land on without wrapping onto the neighbouring row
+    if dx > 0:
+        return BOARD_MASK & ~FIRST_COLUMN
+    if dx < 0:
+        return BOARD_MASK & ~LAST_COLUMN
+    return BOARD_MASK
+
+# (direction, bit shift, landing mask) for each move, built once
+_DIR_STEPS = tuple((d, dy * COLS + dx, _step_mask(dx)) for d, (dx, dy) in DIRECTIONS.items())
+
+@functools.lru_cache(maxsize=64)
+def render_text(font, text, color):
+    # Text surfaces are reused across frames; only new strings reach the font renderer
+    return font.render(text, True, color).convert_alpha()
 
 class SnakeGame:
     def __init__(self):
@@ -20,7 +53,7 @@ class SnakeGame:
         self.running, self.paused, self.started = False, False, False
         self.welcome_screen = True
         self.preview_mode = False
-        self.moves = []
+        self.gif_writer = None
         self.snake_color = GREEN
         self.food_color = RED
         self.default_start = (WIDTH // 2, HEIGHT // 2)
@@ -30,52 +63,75 @@ class SnakeGame:
         self.color_input = "(0, 255, 0)"  # Default green
         self.position_input = f"({self.default_start[0]}, {self.default_start[1]})"
         self.error_message = ""
+        self.welcome_background = self.build_welcome_background()
+        self.welcome_dirty = True
+        self.food_surface = self.make_cell_surface(self.food_color)
+        self.blank_surface = self.make_cell_surface(BLACK)
         self.reset()
 
     def reset(self):
         self.snake = [self.snake_start]
+        self.segment_surface = self.make_cell_surface(self.snake_color)
+        self.snake_mask = cell_bit(self.snake_start)
         self.food = self.food_start
         self.direction = 'RIGHT'
-        self.moves.clear()
+        self.full_update = True
+        self.save_gif()
         self.error_message = ""
 
-    def draw_button(self, text, x, y, width, height, color, disabled=False):
+    def make_cell_surface(self, color):
+        cell = pygame.Surface((GRID_SIZE, GRID_SIZE)).convert()
+        cell.fill(color)
+        return cell
+
+    def draw_button(self, surface, text, x, y, width, height, color, disabled=False):
         rect = pygame.Rect(x, y, width, height)
         button_color = GRAY if disabled else color
-        pygame.draw.rect(self.screen, button_color, rect, border_radius=10)
-        pygame.draw.rect(self.screen, WHITE, rect, 3, border_radius=10)
+        pygame.draw.rect(surface, button_color, rect, border_radius=10)
+        pygame.draw.rect(surface, WHITE, rect, 3, border_radius=10)
         text_surf = self.font.render(text, True, WHITE)
         text_rect = text_surf.get_rect(center=(x + width // 2, y + height // 2))
-        self.screen.blit(text_surf, text_rect)
+        surface.blit(text_surf, text_rect)
         return rect
 
-    def draw_textbox(self, label, text, x, y, width, height):
-        pygame.draw.rect(self.screen, GRAY, (x, y, width, height), border_radius=5)
-        pygame.draw.rect(self.screen, WHITE, (x, y, width, height), 2, border_radius=5)
-        text_surf = self.font.render(text, True, BLACK)
+    def draw_textbox(self, surface, label, x, y, width, height):
+        pygame.draw.rect(surface, GRAY, (x, y, width, height), border_radius=5)
+        pygame.draw.rect(surface, WHITE, (x, y, width, height), 2, border_radius=5)
         label_surf = self.font.render(label, True, WHITE)
-        self.screen.blit(label_surf, (x, y - 25))
-        self.screen.blit(text_surf, (x + 5, y + 5))
+        surface.blit(label_surf, (x, y - 25))
         return pygame.Rect(x, y, width, height)
 
-    def draw_welcome_screen(self):
+    def build_welcome_background(self):
+        # Everything on the welcome screen that never changes, drawn once
+        background = pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(BLACK)
+
         # Title
         title = self.font.render("AI Snake Game", True, WHITE)
-        self.screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 30))
+        background.blit(title, (WIDTH // 2 - title.get_width() // 2, 30))
         
         # Input boxes
-        color_box = self.draw_textbox("Snake Color (RGB):", self.color_input, 100, 100, 200, 30)
-        position_box = self.draw_textbox("Start Position (x,y):", self.position_input, 100, 150, 200, 30)
+        self.color_box = self.draw_textbox(background, "Snake Color (RGB):", 100, 100, 200, 30)
+        self.position_box = self.draw_textbox(background, "Start Position (x,y):", 100, 150, 200, 30)
         
         # Buttons
-        preview_button = self.draw_button("Preview", 80, 200, 100, 40, BLUE)
-        start_button = self.draw_button("Start Game", 220, 200, 100, 40, GREEN)
+        self.preview_button = self.draw_button(background, "Preview", 80, 200, 100, 40, BLUE)
+        self.start_button = self.draw_button(background, "Start Game", 220, 200, 100, 40, GREEN)
+        return background
+
+    def draw_welcome_screen(self):
+        self.screen.blit(self.welcome_background, (0, 0))
+
+        # Input box contents
+        for box, text in ((self.color_box, self.color_input), (self.position_box, self.position_input)):
+            text_surf = render_text(self.font, text, BLACK)
+            self.screen.blit(text_surf, (box.x + 5, box.y + 5))
         
         # Preview area
         if self.preview_mode:
             pygame.draw.rect(self.screen, BLACK, (50, 250, 300, 120), border_radius=10)
             pygame.draw.rect(self.screen, WHITE, (50, 250, 300, 120), 2, border_radius=10)
-            preview_title = self.small_font.render("Preview:", True, WHITE)
+            preview_title = render_text(self.small_font, "Preview:", WHITE)
             self.screen.blit(preview_title, (60, 260))
             
             # Display a miniature version of the game board
@@ -87,8 +143,8 @@ class SnakeGame:
             scale_x = 200 / WIDTH
             scale_y = 80 / HEIGHT
             
-            try:
-                snake_pos = eval(self.position_input)
+            snake_pos = parse_ints(_PAIR, self.position_input)
+            if snake_pos:
                 snake_preview_x = 100 + int(snake_pos[0] * scale_x)
                 snake_preview_y = 280 + int(snake_pos[1] * scale_y)
                 pygame.draw.rect(self.screen, self.snake_color, 
@@ -102,103 +158,137 @@ class SnakeGame:
                                 (food_preview_x, food_preview_y, 
                                  max(5, int(GRID_SIZE * scale_x)), 
                                  max(5, int(GRID_SIZE * scale_y))))
-            except:
-                error_text = self.small_font.render("Invalid position format", True, RED)
+            else:
+                error_text = render_text(self.small_font, "Invalid position format", RED)
                 self.screen.blit(error_text, (110, 310))
         
         # Error message
         if self.error_message:
-            error_text = self.small_font.render(self.error_message, True, RED)
+            error_text = render_text(self.small_font, self.error_message, RED)
             self.screen.blit(error_text, (WIDTH // 2 - error_text.get_width() // 2, 370))
         
-        return color_box, position_box, preview_button, start_button
+        return self.color_box, self.position_box, self.preview_button, self.start_button
 
     def validate_inputs(self):
-        try:
-            # Validate color
-            color = eval(self.color_input)
-            if (not isinstance(color, tuple) or len(color) != 3 or 
-                not all(isinstance(c, int) and 0 <= c <= 255 for c in color)):
-                self.error_message = "Invalid color format. Use (R,G,B) with values 0-255."
-                return False
-            
-            # Validate position
-            pos = eval(self.position_input)
-            if (not isinstance(pos, tuple) or len(pos) != 2 or 
-                not all(isinstance(p, int) for p in pos) or
-                not (0 <= pos[0] < WIDTH and 0 <= pos[1] < HEIGHT)):
-                self.error_message = "Invalid position. Must be within game bounds."
-                return False
-                
-            # Align to grid
-            aligned_pos = (pos[0] - pos[0] % GRID_SIZE, pos[1] - pos[1] % GRID_SIZE)
-            if pos != aligned_pos:
-                self.position_input = str(aligned_pos)
-                self.error_message = "Position adjusted to align with grid."
-            else:
-                self.error_message = ""
-                
-            self.snake_color = color
-            self.snake_start = aligned_pos
-            return True
-        except:
+        color = parse_ints(_TRIPLE, self.color_input)
+        pos = parse_ints(_PAIR, self.position_input)
+        if color is None or pos is None:
             self.error_message = "Invalid input format. Check your syntax."
             return False
 
+        # Validate color
+        if not all(0 <= c <= 255 for c in color):
+            self.error_message = "Invalid color format. Use (R,G,B) with values 0-255."
+            return False
+        
+        # Validate position
+        if not (0 <= pos[0] < WIDTH and 0 <= pos[1] < HEIGHT):
+            self.error_message = "Invalid position. Must be within game bounds."
+            return False
+            
+        # Align to grid
+        aligned_pos = (pos[0] - pos[0] % GRID_SIZE, pos[1] - pos[1] % GRID_SIZE)
+        if pos != aligned_pos:
+            self.position_input = str(aligned_pos)
+            self.error_message = "Position adjusted to align with grid."
+        else:
+            self.error_message = ""
+            
+        self.snake_color = color
+        self.snake_start = aligned_pos
+        return True
+
     def move_snake(self):
         if self.snake and self.direction:
             head_x, head_y = self.snake[0]
             move_x, move_y = DIRECTIONS[self.direction]
             new_head = (head_x + move_x * GRID_SIZE, head_y + move_y * GRID_SIZE)
             
-            if new_head in self.snake or not (0 <= new_head[0] < WIDTH and 0 <= new_head[1] < HEIGHT):
+            if (not (0 <= new_head[0] < WIDTH and 0 <= new_head[1] < HEIGHT) or
+                    self.snake_mask & cell_bit(new_head)):
                 self.running = False
-                return
+                return []
             
+            # Draw only the cells that change this tick and report them as dirty
+            dirty = [self.screen.blit(self.segment_surface, new_head)]
             self.snake.insert(0, new_head)
+            self.snake_mask |= cell_bit(new_head)
             if new_head == self.food:
                 self.food = (random.randint(0, WIDTH // GRID_SIZE - 1) * GRID_SIZE,
                              random.randint(0, HEIGHT // GRID_SIZE - 1) * GRID_SIZE)
+                # Food that lands on the body stays hidden under it
+                if not self.snake_mask & cell_bit(self.food):
+                    dirty.append(self.screen.blit(self.food_surface, self.food))
             else:
-                self.snake.pop()
-            
-            self.moves.append(self.screen.copy())
+                tail = self.snake.pop()
+                self.snake_mask &= ~cell_bit(tail)
+                uncovered = self.food_surface if tail == self.food else self.blank_surface
+                dirty.append(self.screen.blit(uncovered, tail))
+            return dirty
+        return []
+
+    def record_frame(self):
+        # Stream each frame straight into the GIF instead of keeping Surface copies around
+        if self.gif_writer is None:
+            self.gif_writer = imageio.get_writer("snake_replay.gif", mode='I', duration=0.1)
+        frame = np.frombuffer(pygame.image.tobytes(self.screen, "RGB"), dtype=np.uint8)
+        self.gif_writer.append_data(frame.reshape(HEIGHT, WIDTH, 3))
 
     def bfs_search(self):
-        queue = deque([(self.snake[0], [])])
-        visited = set()
-        while queue:
-            (x, y), path = queue.popleft()
-            if (x, y) == self.food:
-                return path
-            for d in DIRECTIONS:
-                nx, ny = x + DIRECTIONS[d][0] * GRID_SIZE, y + DIRECTIONS[d][1] * GRID_SIZE
-                if (nx, ny) not in visited and 0 <= nx < WIDTH and 0 <= ny < HEIGHT and (nx, ny) not in self.snake:
-                    queue.append(((nx, ny), path + [d]))
-                    visited.add((nx, ny))
-        return []
+        # Wavefront BFS on the bitboard: each step grows the frontier by one cell in all
+        # directions with a shift and a mask per direction, and remembers which direction
+        # first reached every new cell
+        head = cell_bit(self.snake[0])
+        food = cell_bit(self.food)
+        if self.snake_mask & food:
+            return []
+        visited = self.snake_mask | head
+        arrived = [0] * len(_DIR_STEPS)
+        frontier = head
+        while not visited & food:
+            grown = 0
+            for i, (_, shift, landing) in enumerate(_DIR_STEPS):
+                reached = (frontier << shift if shift > 0 else frontier >> -shift) & landing & ~visited
+                arrived[i] |= reached
+                visited |= reached
+                grown |= reached
+            if not grown:
+                return []
+            frontier = grown
+
+        path = []
+        cell = food
+        while cell != head:
+            for i, (d, shift, _) in enumerate(_DIR_STEPS):
+                if arrived[i] & cell:
+                    break
+            path.append(d)
+            cell = cell >> shift if shift > 0 else cell << -shift
+        path.reverse()
+        return path
 
     def run(self):
         active_input = None
         while True:
-            self.screen.fill(BLACK)
-            
             if self.welcome_screen:
-                color_box, position_box, preview_button, start_button = self.draw_welcome_screen()
-                
+                # Only text-box edits are redrawn in place; anything that can change the
+                # preview or the error line repaints the whole welcome screen
+                typed_rects = []
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         pygame.quit()
                         return
                     elif event.type == pygame.MOUSEBUTTONDOWN:
-                        if color_box.collidepoint(event.pos):
+                        if self.color_box.collidepoint(event.pos):
                             active_input = 'color'
-                        elif position_box.collidepoint(event.pos):
+                        elif self.position_box.collidepoint(event.pos):
                             active_input = 'position'
-                        elif preview_button.collidepoint(event.pos):
+                        elif self.preview_button.collidepoint(event.pos):
+                            self.welcome_dirty = True
                             if self.validate_inputs():
                                 self.preview_mode = True
-                        elif start_button.collidepoint(event.pos):
+                        elif self.start_button.collidepoint(event.pos):
+                            self.welcome_dirty = True
                             if self.validate_inputs():
                                 self.welcome_screen = False
                                 self.started = True
@@ -207,7 +297,9 @@ class SnakeGame:
                     elif event.type == pygame.KEYDOWN and active_input:
                         if event.key == pygame.K_RETURN:
                             active_input = None
+                            self.welcome_dirty = True
                             self.validate_inputs()
+                            continue
                         elif event.key == pygame.K_BACKSPACE:
                             if active_input == 'color':
                                 self.color_input = self.color_input[:-1]
@@ -218,13 +310,21 @@ class SnakeGame:
                                 self.color_input += event.unicode
                             elif active_input == 'position':
                                 self.position_input += event.unicode
+                        if active_input == 'position' and self.preview_mode:
+                            self.welcome_dirty = True
+                        else:
+                            box = self.color_box if active_input == 'color' else self.position_box
+                            typed_rects.append(pygame.Rect(0, box.y, WIDTH, box.height))
+                
+                if self.welcome_screen and (self.welcome_dirty or typed_rects):
+                    self.draw_welcome_screen()
+                    if self.welcome_dirty:
+                        pygame.display.flip()
+                    else:
+                        pygame.display.update(typed_rects)
+                    self.welcome_dirty = False
             
             elif self.started:
-                # Draw game elements
-                pygame.draw.rect(self.screen, self.food_color, (*self.food, GRID_SIZE, GRID_SIZE))
-                for segment in self.snake:
-                    pygame.draw.rect(self.screen, self.snake_color, (*segment, GRID_SIZE, GRID_SIZE))
-                
                 # Handle game events
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
@@ -236,32 +336,52 @@ class SnakeGame:
                             self.paused = not self.paused
                         elif event.key == pygame.K_ESCAPE:
                             self.welcome_screen = True
+                            self.welcome_dirty = True
                             self.started = False
                 
                 # Update game state
+                dirty = []
                 if self.running and not self.paused:
                     path = self.bfs_search()
                     if path:
                         self.direction = path[0]
-                    self.move_snake()
+                    dirty = self.move_snake()
+                
+                # move_snake already drew its changes; redraw everything only when an
+                # overlay is showing, was just taken down, or a new game started
+                overlay = not self.running or self.paused
+                full_redraw = overlay or self.full_update
+                if full_redraw:
+                    self.screen.fill(BLACK)
+                    self.screen.blit(self.food_surface, self.food)
+                    self.screen.blits([(self.segment_surface, segment) for segment in self.snake], doreturn=False)
+                if dirty:
+                    self.record_frame()
                 
                 # Draw game status
                 if not self.running:
-                    game_over = self.font.render("Game Over", True, WHITE)
-                    restart = self.small_font.render("Press ESC to return to menu", True, WHITE)
+                    game_over = render_text(self.font, "Game Over", WHITE)
+                    restart = render_text(self.small_font, "Press ESC to return to menu", WHITE)
                     self.screen.blit(game_over, (WIDTH // 2 - game_over.get_width() // 2, HEIGHT // 2 - 20))
                     self.screen.blit(restart, (WIDTH // 2 - restart.get_width() // 2, HEIGHT // 2 + 20))
                 elif self.paused:
-                    paused_text = self.font.render("Paused", True, WHITE)
+                    paused_text = render_text(self.font, "Paused", WHITE)
                     self.screen.blit(paused_text, (WIDTH // 2 - paused_text.get_width() // 2, HEIGHT // 2))
+                
+                # Only the moved cells need to reach the window otherwise
+                if full_redraw:
+                    pygame.display.flip()
+                    self.full_update = overlay
+                else:
+                    pygame.display.update(dirty)
             
-            pygame.display.flip()
-            self.clock.tick(10)
+            # Typing stays responsive on the welcome screen; the game itself steps at 10 FPS
+            self.clock.tick(60 if self.welcome_screen else 10)
 
     def save_gif(self):
-        if self.moves:
-            images = [pygame.surfarray.array3d(surface).swapaxes(0, 1) for surface in self.moves]
-            imageio.mimsave("snake_replay.gif", images, duration=0.1)
+        if self.gif_writer is not None:
+            self.gif_writer.close()
+            self.gif_writer = None
 
 if __name__ == "__main__":
     game = SnakeGame()
@@ -1,6 +1,9 @@
 import pygame
+import functools
+import heapq
 import random
-from collections import deque
+import re
+import numpy as np
 
 # Constants for the game grid
 GRID_SIZE = 10  # 12x12 grid
@@ -20,12 +23,22 @@ GRAY = (200, 200, 200)
 LIGHT_BLUE = (173, 216, 230)
 YELLOW = (255, 255, 0)
 
-# Entities
-AGENT = "A"
-WUMPUS = "W"
-GOLD = "G"
-PIT = "P"
-EMPTY = "_"
+# Entities, stored as uint8 cell codes; everything below WUMPUS can be walked on
+EMPTY = 0
+AGENT = 1
+GOLD = 2
+WUMPUS = 3
+PIT = 4
+
+# Row/column offsets of the four neighbours of a cell
+NEIGHBOR_STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# MANHATTAN[goal][cell]: grid distance between two flat cell indices, for the A* heuristic
+_rows, _cols = np.divmod(np.arange(GRID_SIZE * GRID_SIZE), GRID_SIZE)
+MANHATTAN = (np.abs(_rows[:, None] - _rows) + np.abs(_cols[:, None] - _cols)).astype(np.uint8).tolist()
+
+# "row,col" with two non-negative integer fields
+POSITION_PATTERN = re.compile(r"\s*(\d+)\s*,\s*(\d+)\s*")
 
 # Initialize Pygame
 pygame.init()
@@ -33,6 +46,11 @@ pygame.font.init()
 font = pygame.font.SysFont('Arial', 24)
 small_font = pygame.font.SysFont('Arial', 18)
 
+@functools.lru_cache(maxsize=64)
+def render_text(text_font, text, color):
+    # Text surfaces are reused across frames; only new strings reach the font renderer
+    return text_font.render(text, True, color).convert_alpha()
+
 # Game states
 WELCOME_SCREEN = 0
 GAME_RUNNING = 1
@@ -44,6 +62,7 @@ class Button:
         self.color = color
         self.hover_color = (min(color[0] + 30, 255), min(color[1] + 30, 255), min(color[2] + 30, 255))
         self.active_color = color
+        self.text_surface = font.render(text, True, BLACK).convert_alpha()
         
     def draw(self, surface):
         mouse_pos = pygame.mouse.get_pos()
@@ -53,9 +72,8 @@ class Button:
             pygame.draw.rect(surface, self.active_color, self.rect)
         
         pygame.draw.rect(surface, BLACK, self.rect, 2)
-        text_surface = font.render(self.text, True, BLACK)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
+        text_rect = self.text_surface.get_rect(center=self.rect.center)
+        surface.blit(self.text_surface, text_rect)
         
     def is_clicked(self, pos):
         return self.rect.collidepoint(pos)
@@ -66,7 +84,7 @@ class TextInput:
         self.text = default_text
         self.label = label
         self.active = False
-        self.label_surface = font.render(label, True, BLACK)
+        self.label_surface = font.render(label, True, BLACK).convert_alpha()
         
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -93,13 +111,19 @@ class TextInput:
         pygame.draw.rect(surface, BLACK, self.rect, 2)
         
         # Draw text
-        text_surface = font.render(self.text, True, BLACK)
+        text_surface = render_text(font, self.text, BLACK)
         surface.blit(text_surface, (self.rect.x + 5, self.rect.y + 5))
 
+def parse_position(pos_str):
+    match = POSITION_PATTERN.fullmatch(pos_str)
+    if not match:
+        raise ValueError(f"Invalid position: {pos_str!r}")
+    return int(match.group(1)), int(match.group(2))
+
 def generate_custom_grid(agent_pos_str, gold_pos_str, num_wumpus=1, num_pits=9):
     try:
-        agent_pos = tuple(map(int, agent_pos_str.split(',')))
-        gold_pos = tuple(map(int, gold_pos_str.split(',')))
+        agent_pos = parse_position(agent_pos_str)
+        gold_pos = parse_position(gold_pos_str)
         
         # Validate positions
         if not (0 <= agent_pos[0] < GRID_SIZE and 0 <= agent_pos[1] < GRID_SIZE):
@@ -107,38 +131,24 @@ def generate_custom_grid(agent_pos_str, gold_pos_str, num_wumpus=1, num_pits=9):
         if not (0 <= gold_pos[0] < GRID_SIZE and 0 <= gold_pos[1] < GRID_SIZE):
             gold_pos = (GRID_SIZE-1, GRID_SIZE-1)
             
-        grid = [[EMPTY for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        grid = np.full((GRID_SIZE, GRID_SIZE), EMPTY, dtype=np.uint8)
         
-        # Place wumpuses
-        wumpus_positions = []
-        for _ in range(num_wumpus):
-            while True:
-                wumpus_pos = (random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1))
-                if wumpus_pos != agent_pos and wumpus_pos != gold_pos and wumpus_pos not in wumpus_positions:
-                    wumpus_positions.append(wumpus_pos)
-                    break
-        
-        # Place pits
-        pit_positions = []
-        for _ in range(num_pits):
-            attempts = 0
-            while attempts < 100:  # Prevent infinite loop
-                pit_pos = (random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1))
-                if (pit_pos != agent_pos and pit_pos != gold_pos and 
-                    pit_pos not in wumpus_positions and pit_pos not in pit_positions):
-                    pit_positions.append(pit_pos)
-                    break
-                attempts += 1
+        # Place wumpuses and pits on distinct free cells in one draw
+        free_cells = [(row, col) for row in range(GRID_SIZE) for col in range(GRID_SIZE)
+                      if (row, col) != agent_pos and (row, col) != gold_pos]
+        chosen = random.sample(free_cells, min(num_wumpus + num_pits, len(free_cells)))
+        wumpus_positions = chosen[:num_wumpus]
+        pit_positions = chosen[num_wumpus:]
             
         # Populate grid
-        grid[agent_pos[0]][agent_pos[1]] = AGENT
-        grid[gold_pos[0]][gold_pos[1]] = GOLD
+        grid[agent_pos] = AGENT
+        grid[gold_pos] = GOLD
         
         for pos in wumpus_positions:
-            grid[pos[0]][pos[1]] = WUMPUS
+            grid[pos] = WUMPUS
             
         for pos in pit_positions:
-            grid[pos[0]][pos[1]] = PIT
+            grid[pos] = PIT
             
         return grid, agent_pos, gold_pos, wumpus_positions[0] if wumpus_positions else None
         
@@ -147,7 +157,7 @@ def generate_custom_grid(agent_pos_str, gold_pos_str, num_wumpus=1, num_pits=9):
         return generate_random_grid()
 
 def generate_random_grid():
-    grid = [[EMPTY for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+    grid = np.full((GRID_SIZE, GRID_SIZE), EMPTY, dtype=np.uint8)
     
     # Place agent in the top-left corner
     agent_pos = (0, 0)
@@ -155,48 +165,59 @@ def generate_random_grid():
     # Place gold in the bottom-right corner
     gold_pos = (GRID_SIZE-1, GRID_SIZE-1)
     
-    # Place wumpus randomly, but not on agent or gold
-    while True:
-        wumpus_pos = (random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1))
-        if wumpus_pos != agent_pos and wumpus_pos != gold_pos:
-            break
-    
-    # Place pits randomly
-    pits = set()
-    while len(pits) < 9:
-        pit_pos = (random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1))
-        if pit_pos != agent_pos and pit_pos != gold_pos and pit_pos != wumpus_pos:
-            pits.add(pit_pos)
+    # Place the wumpus and 9 pits on distinct cells, none on the agent or gold
+    free_cells = [(row, col) for row in range(GRID_SIZE) for col in range(GRID_SIZE)
+                  if (row, col) != agent_pos and (row, col) != gold_pos]
+    wumpus_pos, *pits = random.sample(free_cells, 10)
    
-    grid[agent_pos[0]][agent_pos[1]] = AGENT
-    grid[gold_pos[0]][gold_pos[1]] = GOLD
-    grid[wumpus_pos[0]][wumpus_pos[1]] = WUMPUS
+    grid[agent_pos] = AGENT
+    grid[gold_pos] = GOLD
+    grid[wumpus_pos] = WUMPUS
     
     for pit in pits:
-        grid[pit[0]][pit[1]] = PIT
+        grid[pit] = PIT
     
     return grid, agent_pos, gold_pos, wumpus_pos
 
+# Pre-rendered tile for each cell value and the empty board with its grid lines, filled in
+# by init_tile_surfaces() once a display exists
+TILE_SURFACES = {}
+GRID_BACKGROUND = None
+
+def make_tile(draw_entity=None):
+    tile = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+    tile.fill(WHITE)
+    pygame.draw.rect(tile, BLACK, (0, 0, TILE_SIZE, TILE_SIZE), 1)
+    if draw_entity:
+        draw_entity(tile)
+    return tile
+
+def init_tile_surfaces():
+    center = (TILE_SIZE // 2, TILE_SIZE // 2)
+    TILE_SURFACES[EMPTY] = make_tile()
+    TILE_SURFACES[AGENT] = make_tile(lambda tile: pygame.draw.circle(tile, BLUE, center, TILE_SIZE // 3))
+    TILE_SURFACES[WUMPUS] = make_tile(lambda tile: pygame.draw.circle(tile, RED, center, TILE_SIZE // 3))
+    TILE_SURFACES[GOLD] = make_tile(lambda tile: pygame.draw.circle(tile, GREEN, center, TILE_SIZE // 3))
+    TILE_SURFACES[PIT] = make_tile(lambda tile: pygame.draw.rect(tile, BLACK, (10, 10, TILE_SIZE - 20, TILE_SIZE - 20)))
+    
+    global GRID_BACKGROUND
+    GRID_BACKGROUND = pygame.Surface((WIDTH, HEIGHT)).convert()
+    GRID_BACKGROUND.blits([(TILE_SURFACES[EMPTY], (col * TILE_SIZE, row * TILE_SIZE))
+                           for row in range(GRID_SIZE) for col in range(GRID_SIZE)], doreturn=False)
+
 def draw_grid(surface, grid):
+    draw_tiles(surface, grid)
+    draw_legend(surface)
 
-    surface.fill(WHITE)
+def draw_tiles(surface, grid):
+    # Empty cells and grid lines come from the cached background; only occupied cells are blitted
+    surface.blit(GRID_BACKGROUND, (0, 0))
+    rows, cols = np.nonzero(grid)
+    surface.blits([(TILE_SURFACES[cell], (col * TILE_SIZE, row * TILE_SIZE))
+                   for row, col, cell in zip(rows.tolist(), cols.tolist(), grid[rows, cols].tolist())],
+                  doreturn=False)
 
-    for row in range(GRID_SIZE):
-        for col in range(GRID_SIZE):
-            x, y = col * TILE_SIZE, row * TILE_SIZE
-            pygame.draw.rect(surface, BLACK, (x, y, TILE_SIZE, TILE_SIZE), 1)
-            
-            cell_value = grid[row][col]
-            if cell_value == AGENT:
-                pygame.draw.circle(surface, BLUE, (x + TILE_SIZE // 2, y + TILE_SIZE // 2), TILE_SIZE // 3)
-            elif cell_value == WUMPUS:
-                pygame.draw.circle(surface, RED, (x + TILE_SIZE // 2, y + TILE_SIZE // 2), TILE_SIZE // 3)
-            elif cell_value == GOLD:
-                pygame.draw.circle(surface, GREEN, (x + TILE_SIZE // 2, y + TILE_SIZE // 2), TILE_SIZE // 3)
-            elif cell_value == PIT:
-                pygame.draw.rect(surface, BLACK, (x + 10, y + 10, TILE_SIZE - 20, TILE_SIZE - 20))
-                
-    # Add legend
+def draw_legend(surface):
     legend_y = 10
     legend_x = 10
     
@@ -209,39 +230,63 @@ def draw_grid(surface, grid):
     
     for color, text in legend_items:
         pygame.draw.circle(surface, color, (legend_x + 10, legend_y + 10), 10)
-        text_surface = small_font.render(text, True, BLACK)
+        text_surface = render_text(small_font, text, BLACK)
         surface.blit(text_surface, (legend_x + 30, legend_y))
         legend_y += 30
 
-def bfs_search(grid, start, goal):
-    queue = deque([(start, [])])
-    visited = set()
+def astar_search(grid, start, goal):
+    # A* over flat cell indices; parents and path costs live in preallocated arrays and the
+    # heuristic is a table lookup, so each expansion is a few list reads and a heap push
+    passable = (grid < WUMPUS).ravel().tolist()
+    heuristic = MANHATTAN[goal[0] * GRID_SIZE + goal[1]]
+    parent = [-1] * (GRID_SIZE * GRID_SIZE)
+    cost = [GRID_SIZE * GRID_SIZE] * (GRID_SIZE * GRID_SIZE)
+    source = start[0] * GRID_SIZE + start[1]
+    target = goal[0] * GRID_SIZE + goal[1]
+    parent[source] = source
+    cost[source] = 0
+    open_heap = [(heuristic[source], 0, source)]
     
-    while queue:
-        (x, y), path = queue.popleft()
+    while open_heap:
+        _, g, cell = heapq.heappop(open_heap)
         
-        if (x, y) == goal:
-            return path + [(x, y)]
-            
-        if (x, y) in visited:
+        if cell == target:
+            path = [divmod(cell, GRID_SIZE)]
+            while cell != source:
+                cell = parent[cell]
+                path.append(divmod(cell, GRID_SIZE))
+            path.reverse()
+            return path
+        
+        if g > cost[cell]:
             continue
-            
-        visited.add((x, y))
         
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+        x, y = divmod(cell, GRID_SIZE)
+        for dx, dy in NEIGHBOR_STEPS:
             nx, ny = x + dx, y + dy
-            if (0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE and 
-                grid[nx][ny] != PIT and grid[nx][ny] != WUMPUS):
-                queue.append(((nx, ny), path + [(x, y)]))
+            if 0 <= nx < GRID_SIZE and 0 <= ny < GRID_SIZE:
+                neighbor = nx * GRID_SIZE + ny
+                if passable[neighbor] and g + 1 < cost[neighbor]:
+                    cost[neighbor] = g + 1
+                    parent[neighbor] = cell
+                    heapq.heappush(open_heap, (g + 1 + heuristic[neighbor], g + 1, neighbor))
                 
     return []
 
 def move_agent(grid, path, screen):
-    temp_grid = [row[:] for row in grid]  # Create a copy of the grid
+    # The board never changes while the agent walks, so render it once without the agent
+    # and draw the agent tile on top at its current step
+    board = grid.copy()
+    board[board == AGENT] = EMPTY
+    board_background = pygame.Surface((WIDTH, HEIGHT)).convert()
+    draw_tiles(board_background, board)
+    agent_tile = TILE_SURFACES[AGENT]
     
     # Initialize pause state
     paused = False
     current_step = 0
+    clock = pygame.time.Clock()
+    step_started = pygame.time.get_ticks()
     
     while current_step < len(path):
         # Process events to keep the window responsive
@@ -254,14 +299,24 @@ def move_agent(grid, path, screen):
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     paused = not paused
+                    step_started = pygame.time.get_ticks()
+        
+        # Advance one step every 300 ms unless paused
+        if not paused and pygame.time.get_ticks() - step_started >= 300:
+            current_step += 1
+            step_started += 300
+            if current_step == len(path):
+                break
+        
+        # Draw the board with the agent at its current position
+        row, col = path[current_step]
+        screen.blit(board_background, (0, 0))
+        screen.blit(agent_tile, (col * TILE_SIZE, row * TILE_SIZE))
+        draw_legend(screen)
         
-        # Skip movement logic if paused
         if paused:
-            # Draw current state
-            draw_grid(screen, temp_grid)
-            
             # Draw pause indicator
-            pause_text = font.render("PAUSED - Press SPACE to continue", True, RED)
+            pause_text = render_text(font, "PAUSED - Press SPACE to continue", RED)
             text_bg = pygame.Rect(WIDTH//2 - pause_text.get_width()//2 - 10, 
                                 HEIGHT//2 - pause_text.get_height()//2 - 10,
                                 pause_text.get_width() + 20, 
@@ -269,40 +324,41 @@ def move_agent(grid, path, screen):
             pygame.draw.rect(screen, YELLOW, text_bg)
             pygame.draw.rect(screen, BLACK, text_bg, 2)
             screen.blit(pause_text, (WIDTH//2 - pause_text.get_width()//2, HEIGHT//2 - pause_text.get_height()//2))
-            
-            pygame.display.flip()
-            pygame.time.delay(50)  # Small delay to prevent CPU hogging
-            continue
-        
-        # Get current position
-        pos = path[current_step]
-        
-        # Reset the previous position to EMPTY
-        if current_step > 0:
-            prev_pos = path[current_step-1]
-            temp_grid[prev_pos[0]][prev_pos[1]] = EMPTY
-        
-        # Set current position to AGENT
-        temp_grid[pos[0]][pos[1]] = AGENT
-        
-        # Draw and delay
-        draw_grid(screen, temp_grid)
-        
-        # Display controls info
-        controls_text = small_font.render("Press SPACE to pause/resume", True, BLACK)
-        screen.blit(controls_text, (WIDTH//2 - controls_text.get_width()//2, HEIGHT - 30))
+        else:
+            # Display controls info
+            controls_text = render_text(small_font, "Press SPACE to pause/resume", BLACK)
+            screen.blit(controls_text, (WIDTH//2 - controls_text.get_width()//2, HEIGHT - 30))
         
         pygame.display.flip()
-        pygame.time.delay(300)
-        
-        # Move to next step
-        current_step += 1
+        clock.tick(30)
+
+def make_preview(grid, path, preview_scale=0.4):
+    # Scaled-down board for the setup screen, rendered once per generated grid
+    preview_surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+    draw_grid(preview_surface, grid)
+    scaled_preview = pygame.transform.smoothscale(
+        preview_surface, 
+        (int(WIDTH * preview_scale), int(HEIGHT * preview_scale))
+    )
+    return scaled_preview, len(path) if path else None
 
 def main():
     # Create a screen for the welcome screen
     welcome_screen = pygame.display.set_mode((WIDTH, WELCOME_HEIGHT))
     game_screen = None
     pygame.display.set_caption("Wumpus AI Game")
+    init_tile_surfaces()
+    
+    # Title and instructions never change, so draw them once
+    welcome_background = pygame.Surface((WIDTH, WELCOME_HEIGHT)).convert()
+    welcome_background.fill(WHITE)
+    title = font.render("Wumpus AI Game - Setup", True, BLACK)
+    welcome_background.blit(title, (WIDTH//2 - title.get_width()//2, 10))
+    instructions = small_font.render(
+        "Set the starting positions for the agent and gold. Format: row,col (0-9)", 
+        True, BLACK
+    )
+    welcome_background.blit(instructions, (WIDTH//2 - instructions.get_width()//2, 50))
     
     # Create UI elements
     agent_input = TextInput(WIDTH//2 - 150, HEIGHT + 30, 300, TEXT_INPUT_HEIGHT, 
@@ -322,6 +378,7 @@ def main():
     gold_pos = None
     wumpus_pos = None
     path = None
+    preview = None
     
     clock = pygame.time.Clock()
     running = True
@@ -340,21 +397,7 @@ def main():
                         # Generate and display preview
                         grid, agent_pos, gold_pos, wumpus_pos = generate_custom_grid(
                             agent_input.text, gold_input.text)
-                        welcome_screen.fill(WHITE)
-                        
-                        # Draw smaller preview grid
-                        preview_surface = pygame.Surface((WIDTH, HEIGHT))
-                        draw_grid(preview_surface, grid)
-                        
-                        # Scale down the preview
-                        preview_scale = 0.5
-                        scaled_preview = pygame.transform.scale(
-                            preview_surface, 
-                            (int(WIDTH * preview_scale), int(HEIGHT * preview_scale))
-                        )
-                        
-                        # Display scaled preview at the top
-                        welcome_screen.blit(scaled_preview, (WIDTH//2 - scaled_preview.get_width()//2, 20))
+                        preview = make_preview(grid, astar_search(grid, agent_pos, gold_pos))
                     
                     elif start_button.is_clicked(event.pos):
                         # Start the game
@@ -363,23 +406,13 @@ def main():
                             agent_input.text, gold_input.text)
                         game_state = GAME_RUNNING
                         
-                        # Find path using BFS
-                        path = bfs_search(grid, agent_pos, gold_pos)
+                        # Find path using A*
+                        path = astar_search(grid, agent_pos, gold_pos)
+                        preview = make_preview(grid, path)
         
         # Rendering
         if game_state == WELCOME_SCREEN:
-            welcome_screen.fill(WHITE)
-            
-            # Draw title
-            title = font.render("Wumpus AI Game - Setup", True, BLACK)
-            welcome_screen.blit(title, (WIDTH//2 - title.get_width()//2, 10))
-            
-            # Draw instructions
-            instructions = small_font.render(
-                "Set the starting positions for the agent and gold. Format: row,col (0-9)", 
-                True, BLACK
-            )
-            welcome_screen.blit(instructions, (WIDTH//2 - instructions.get_width()//2, 50))
+            welcome_screen.blit(welcome_background, (0, 0))
             
             # Draw UI elements
             agent_input.draw(welcome_screen)
@@ -388,28 +421,17 @@ def main():
             start_button.draw(welcome_screen)
             
             # If grid exists, draw preview
-            if grid:
-                preview_surface = pygame.Surface((WIDTH, HEIGHT))
-                draw_grid(preview_surface, grid)
-                
-                # Scale down the preview
-                preview_scale = 0.4
-                scaled_preview = pygame.transform.scale(
-                    preview_surface, 
-                    (int(WIDTH * preview_scale), int(HEIGHT * preview_scale))
-                )
-                
-                # Display scaled preview
+            if preview is not None:
+                scaled_preview, path_length = preview
                 welcome_screen.blit(scaled_preview, (WIDTH//2 - scaled_preview.get_width()//2, 100))
                 
                 # Draw path info
-                test_path = bfs_search(grid, agent_pos, gold_pos)
-                if test_path:
-                    path_text = small_font.render(
-                        f"Path found! Length: {len(test_path)} steps", True, GREEN)
+                if path_length:
+                    path_text = render_text(
+                        small_font, f"Path found! Length: {path_length} steps", GREEN)
                 else:
-                    path_text = small_font.render(
-                        "No path found! Agent cannot reach the gold.", True, RED)
+                    path_text = render_text(
+                        small_font, "No path found! Agent cannot reach the gold.", RED)
                 welcome_screen.blit(path_text, (WIDTH//2 - path_text.get_width()//2, 
                                              100 + scaled_preview.get_height() + 20))
                 
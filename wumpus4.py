@@ -1,10 +1,19 @@
 import pygame
+import functools
+import heapq
 import random
 import math
 import os
 import json
-from collections import deque
+import ast
+import atexit
+import queue
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from itertools import islice
 import imageio  # For GIF export
+import numpy as np
 from datetime import datetime
 
 # Constants for the game grid
@@ -17,6 +26,21 @@ UI_PADDING = 20
 SIDEBAR_WIDTH = 300
 GAME_SCREEN_WIDTH = WIDTH + SIDEBAR_WIDTH
 
+# Pixel center of every tile, indexed [row][col]
+TILE_CENTERS = tuple(tuple((col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2)
+                           for col in range(GRID_SIZE)) for row in range(GRID_SIZE))
+PROGRESS_ONE = 1 << 10  # Fixed-point 1.0 for animation progress
+# Tile fractions used by the animation shapes drawn every frame
+TILE_HALF = TILE_SIZE // 2
+TILE_THIRD = TILE_SIZE // 3
+TILE_TENTH = TILE_SIZE // 10
+TRAP_FLASH_SIZE = TILE_SIZE // 1.5
+
+# GIF recording
+GIF_FPS = 20  # Frames per second recorded into GIFs, independent of the game frame rate
+GIF_QUEUE_SIZE = 64  # Frames waiting for the writer thread; extra frames are dropped
+GIF_PALETTE_BITS = 6  # 64-color palette per frame; plenty for the flat UI colors
+
 # Game states
 MAIN_MENU = 0
 GAME_SETUP = 1
@@ -26,6 +50,11 @@ SETTINGS = 4
 STATS_SCREEN = 5
 LEVEL_SELECT = 6
 
+# States that Escape leaves for the main menu
+ESCAPE_TO_MENU_STATES = frozenset((GAME_SETUP, MAP_EDITOR, SETTINGS, STATS_SCREEN, LEVEL_SELECT))
+# Screens drawn from a cached static surface; after the first frame only their buttons are pushed to the display
+STATIC_SCREEN_STATES = frozenset((SETTINGS, STATS_SCREEN))
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -42,23 +71,79 @@ ORANGE = (255, 165, 0)
 BROWN = (139, 69, 19)
 TRANSPARENT_YELLOW = (255, 255, 0, 128)
 
-# Entities
-AGENT = "A"
-WUMPUS = "W"
-GOLD = "G"
-PIT = "P"
-EMPTY = "_"
-TRAIL = "T"
-OBSTACLE = "O"
-TRAP = "X"  # New trap entity
-TELEPORT = "TP"  # New teleport entity
+# Entities (one bit flag per cell of the uint8 grid)
+EMPTY = 0
+AGENT = 1 << 0
+WUMPUS = 1 << 1
+GOLD = 1 << 2
+PIT = 1 << 3
+TRAIL = 1 << 4
+OBSTACLE = 1 << 5
+TRAP = 1 << 6  # New trap entity
+TELEPORT = 1 << 7  # New teleport entity
+
+# Entity groups, tested with a single "cell & MASK"
+DEADLY = WUMPUS | PIT
+BLOCKED = OBSTACLE | WUMPUS
+
+# Four-connected movement offsets used by pathfinding
+DIRS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+PATH_CACHE_SIZE = 32  # Recent (start, goal, weight, grid) searches remembered by GameManager
+# Cost of stepping onto a cell, by code: 0 where blocked, and a small penalty for
+# teleports to avoid teleport loops
+STEP_COST = np.array([0 if code & BLOCKED else 2 if code == TELEPORT else 1 for code in range(256)], dtype=np.int8)
+
+# Character codes used by saved map files
+CODE_TO_CHAR = {
+    EMPTY: "_", AGENT: "A", WUMPUS: "W", GOLD: "G", PIT: "P",
+    TRAIL: "T", OBSTACLE: "O", TRAP: "X", TELEPORT: "TP"
+}
+CHAR_TO_CODE = {char: code for code, char in CODE_TO_CHAR.items()}
+MAP_FORMAT_VERSION = 2  # 2: teleport links saved as [source, destination] pairs
+
+# Lookup tables so whole grids convert with one NumPy indexing operation
+CODE_CHAR_TABLE = np.array([CODE_TO_CHAR.get(code, "_") for code in range(256)], dtype=object)
+SORTED_CHARS = np.array(sorted(CHAR_TO_CODE))
+SORTED_CHAR_CODES = np.array([CHAR_TO_CODE[char] for char in SORTED_CHARS], dtype=np.uint8)
+
+def new_grid(size=GRID_SIZE):
+    """Create an empty size x size grid of cell codes"""
+    return np.full((size, size), EMPTY, dtype=np.uint8)
+
+def grid_to_chars(grid):
+    """Nested lists of map file characters for a grid of cell codes"""
+    return CODE_CHAR_TABLE[grid].tolist()
+
+def chars_to_grid(rows):
+    """Grid of cell codes from nested lists of map file characters"""
+    chars = np.asarray(rows, dtype=str)
+    if chars.ndim != 2:
+        raise ValueError("map grid must be a rectangular list of rows")
+    indices = np.searchsorted(SORTED_CHARS, chars).clip(max=len(SORTED_CHARS) - 1)
+    unknown = SORTED_CHARS[indices] != chars
+    if unknown.any():
+        raise ValueError(f"unknown tile {str(chars[unknown][0])!r} in map grid")
+    return SORTED_CHAR_CODES[indices]
+
+# Order in which a level places its entities, with the settings key for each count
+PLACEMENT_ORDER = ((WUMPUS, "wumpus"), (PIT, "pits"), (OBSTACLE, "obstacles"),
+                   (TRAP, "traps"), (TELEPORT, "teleports"))
+
+@dataclass(frozen=True, slots=True)
+class DiffCfg:
+    """Entity counts for one difficulty; shared between levels, never mutated"""
+    wumpus: int
+    pits: int
+    obstacles: int
+    traps: int
+    teleports: int
 
 # Difficulty settings
 DIFFICULTY_SETTINGS = {
-    "Easy": {"wumpus": 1, "pits": 5, "obstacles": 1, "traps": 0, "teleports": 0},
-    "Medium": {"wumpus": 2, "pits": 8, "obstacles": 3, "traps": 1, "teleports": 0},
-    "Hard": {"wumpus": 3, "pits": 10, "obstacles": 5, "traps": 2, "teleports": 1},
-    "Expert": {"wumpus": 4, "pits": 12, "obstacles": 7, "traps": 3, "teleports": 2}
+    "Easy": DiffCfg(wumpus=1, pits=5, obstacles=1, traps=0, teleports=0),
+    "Medium": DiffCfg(wumpus=2, pits=8, obstacles=3, traps=1, teleports=0),
+    "Hard": DiffCfg(wumpus=3, pits=10, obstacles=5, traps=2, teleports=1),
+    "Expert": DiffCfg(wumpus=4, pits=12, obstacles=7, traps=3, teleports=2)
 }
 
 # Initialize Pygame
@@ -72,36 +157,174 @@ title_font = pygame.font.SysFont('Arial', 36, bold=True)
 small_font = pygame.font.SysFont('Arial', 18)
 tiny_font = pygame.font.SysFont('Arial', 14)
 
+def find_path(grid, start, goal, heuristic_weight=1.0):
+    """A* from start to goal; returns the list of (row, col) steps or [] if unreachable
+    
+    A heuristic_weight above 1 makes the search greedier (weighted A*): it expands
+    fewer cells but may return a path up to that factor longer than the best one.
+    
+    Cells walled in on both sides across the direction of travel are jumped over
+    instead of queued (the straight-line jump of jump point search): their only way
+    on is straight ahead, so expanding them one by one cannot find anything better.
+    Teleports and the goal always end a jump and are expanded normally.
+    """
+    # Per-cell state lives in flat lists indexed over the grid padded with a one-cell
+    # blocked border: no tuple keys to hash, no bounds checks in the inner loop, and
+    # plain list indexing is much faster than NumPy scalars
+    rows, cols = grid.shape
+    width = cols + 2
+    # Cost of stepping onto each cell, 0 on the border so it is never entered
+    step_costs = np.zeros((rows + 2, width), dtype=np.int8)
+    step_costs[1:-1, 1:-1] = STEP_COST[grid]
+    costs = step_costs.ravel().tolist()
+    goal_row, goal_col = goal[0] + 1, goal[1] + 1
+    start_index = (start[0] + 1) * width + start[1] + 1
+    goal_index = goal_row * width + goal_col
+    
+    # Initialize A* variables
+    size = (rows + 2) * width
+    unreached = 2 * rows * cols + 1  # Worse than any real path cost
+    came_from = [-1] * size
+    g_score = [unreached] * size
+    g_score[start_index] = 0
+    closed = bytearray(size)
+    
+    # Binary heap of (f_score, tiebreak, index); outdated entries are skipped when popped
+    counter = 0
+    open_heap = [(heuristic_weight * (abs(start[0] + 1 - goal_row) + abs(start[1] + 1 - goal_col)), counter, start_index)]
+    
+    while open_heap:
+        _, _, current = heapq.heappop(open_heap)
+        if closed[current]:
+            continue
+        closed[current] = 1
+        
+        if current == goal_index:
+            # Reconstruct path
+            path = []
+            while current != start_index:
+                row, col = divmod(current, width)
+                path.append((row - 1, col - 1))
+                current = came_from[current]
+            path.append(start)
+            path.reverse()
+            return path
+        
+        row, col = divmod(current, width)
+        current_g = g_score[current]
+        for dr, dc in DIRS:
+            index = current + dr * width + dc
+            cost = costs[index]
+            if not cost:
+                continue
+            
+            tentative_g = current_g + cost
+            
+            if tentative_g < g_score[index]:
+                came_from[index] = current
+                g_score[index] = tentative_g
+                r, c = row + dr, col + dc
+                
+                # Jump along the corridor, recording every cell so the path stays step by step
+                step, side = dr * width + dc, dc * width + dr
+                while cost == 1 and index != goal_index:
+                    if costs[index + side] or costs[index - side]:
+                        break
+                    next_index = index + step
+                    next_cost = costs[next_index]
+                    if not next_cost:
+                        break
+                    next_g = tentative_g + next_cost
+                    if next_g >= g_score[next_index]:
+                        break
+                    came_from[next_index] = index
+                    g_score[next_index] = next_g
+                    r, c, index, cost, tentative_g = r + dr, c + dc, next_index, next_cost, next_g
+                
+                counter += 1
+                # Manhattan distance heuristic
+                heapq.heappush(open_heap, (tentative_g + heuristic_weight * (abs(r - goal_row) + abs(c - goal_col)),
+                                           counter, index))
+    
+    # No path found
+    return []
+
+# Stats persistence
+STATS_HISTORY_LIMIT = 500  # Most recent games kept in the history
+STATS_FLUSH_INTERVAL = 5000  # ms between writes of changed stats
+
 # Load or generate stats data
 def load_stats():
+    stats = None
     try:
         if os.path.exists('wumpus_stats.json'):
             with open('wumpus_stats.json', 'r') as f:
-                return json.load(f)
+                stats = json.load(f)
     except Exception as e:
         print(f"Error loading stats: {e}")
-    # Default stats
-    return {
-        "games_played": 0,
-        "gold_collected": 0,
-        "total_steps": 0,
-        "deaths": 0,
-        "best_path_length": float('inf'),
-        "best_score": 0,
-        "levels_completed": {},
-        "history": []
-    }
+    if stats is None:
+        # Default stats
+        stats = {
+            "games_played": 0,
+            "gold_collected": 0,
+            "total_steps": 0,
+            "deaths": 0,
+            "best_path_length": None,  # No game won yet
+            "best_score": 0,
+            "levels_completed": {},
+            "history": []
+        }
+    # Path search setting, kept with the stats so it survives restarts
+    stats.setdefault("heuristic_weight", 1.0)
+    # Older files stored "no best path yet" as Infinity
+    if stats.get("best_path_length") == float('inf'):
+        stats["best_path_length"] = None
+    stats["history"] = deque(stats.get("history", []), maxlen=STATS_HISTORY_LIMIT)
+    return stats
 
 stats_data = load_stats()
+stats_dirty = False
+last_stats_flush = 0
 
 def save_stats():
+    global stats_dirty, last_stats_flush
     try:
         with open('wumpus_stats.json', 'w') as f:
-            json.dump(stats_data, f)
+            json.dump(dict(stats_data, history=list(stats_data["history"])), f)
+        stats_dirty = False
     except Exception as e:
         print(f"Error saving stats: {e}")
+    last_stats_flush = pygame.time.get_ticks()
+
+def mark_stats_dirty():
+    """Flag the stats as changed; they get written on the next flush"""
+    global stats_dirty
+    stats_dirty = True
+
+def flush_stats_if_due(now):
+    if stats_dirty and now - last_stats_flush >= STATS_FLUSH_INTERVAL:
+        save_stats()
+
+def flush_stats():
+    if stats_dirty:
+        save_stats()
+
+atexit.register(flush_stats)
+
+@functools.lru_cache(maxsize=256)
+def button_surface(text, fill_color, size):
+    """Pre-composed button look (fill, border, centered label) keyed on (text, color, size)"""
+    text_surface = font.render(text, True, BLACK)
+    baked = pygame.Surface(size).convert()
+    baked.fill(fill_color)
+    pygame.draw.rect(baked, BLACK, baked.get_rect(), 2)
+    baked.blit(text_surface, text_surface.get_rect(center=baked.get_rect().center))
+    return baked
 
 class Button:
+    __slots__ = ('rect', 'text', 'color', 'hover_color', 'active_color', 'disabled_color', 'action',
+                 'disabled', 'background', 'background_hover', 'background_disabled')
+    
     def __init__(self, x, y, width, height, text, color, action=None, disabled=False):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
@@ -112,39 +335,70 @@ class Button:
         self.action = action
         self.disabled = disabled
         
-    def draw(self, surface):
+        # Bake the finished button once per look so drawing is a single blit
+        self.background = self.bake(self.active_color)
+        self.background_hover = self.bake(self.hover_color)
+        self.background_disabled = self.bake(self.disabled_color)
+    
+    def set_color(self, color):
+        """Switch the fill color; looks already baked once are reused from the cache"""
+        if color == self.color:
+            return
+        self.color = color
+        self.active_color = color
+        self.hover_color = (min(color[0] + 30, 255), min(color[1] + 30, 255), min(color[2] + 30, 255))
+        self.background = self.bake(self.active_color)
+        self.background_hover = self.bake(self.hover_color)
+    
+    def bake(self, fill_color):
+        return button_surface(self.text, fill_color, self.rect.size)
+    
+    def current_surface(self, mouse_pos):
         if self.disabled:
-            pygame.draw.rect(surface, self.disabled_color, self.rect)
-        else:
-            mouse_pos = pygame.mouse.get_pos()
-            if self.rect.collidepoint(mouse_pos):
-                pygame.draw.rect(surface, self.hover_color, self.rect)
-            else:
-                pygame.draw.rect(surface, self.active_color, self.rect)
+            return self.background_disabled
+        if self.rect.collidepoint(mouse_pos):
+            return self.background_hover
+        return self.background
         
-        pygame.draw.rect(surface, BLACK, self.rect, 2)
-        text_surface = font.render(self.text, True, BLACK)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
+    def draw(self, surface, mouse_pos=None):
+        if mouse_pos is None:
+            mouse_pos = pygame.mouse.get_pos()
+        surface.blit(self.current_surface(mouse_pos), self.rect)
         
     def is_clicked(self, pos):
         if self.disabled:
             return False
         return self.rect.collidepoint(pos)
 
+@functools.lru_cache(maxsize=512)
+def render_text(text_font, text, color=BLACK):
+    """Antialiased text surface, memoized because most labels are identical every frame
+    
+    Converted to the display's alpha format so the per-frame blits skip pixel conversion.
+    """
+    return text_font.render(text, True, color).convert_alpha()
+
+def draw_buttons(surface, buttons, mouse_pos):
+    """Draw a group of buttons with one batched blits call"""
+    surface.blits([(button.current_surface(mouse_pos), button.rect) for button in buttons], False)
+
 class TextInput:
+    __slots__ = ('rect', 'text', 'label', 'active', 'label_surface', 'text_surface')
+    
     def __init__(self, x, y, width, height, label="", default_text=""):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = default_text
         self.label = label
         self.active = False
-        self.label_surface = font.render(label, True, BLACK)
+        self.label_surface = font.render(label, True, BLACK).convert_alpha()
+        self.text_surface = font.render(self.text, True, BLACK).convert_alpha()
         
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             self.active = self.rect.collidepoint(event.pos)
         
         if event.type == pygame.KEYDOWN and self.active:
+            old_text = self.text
             if event.key == pygame.K_BACKSPACE:
                 self.text = self.text[:-1]
             elif event.key == pygame.K_RETURN:
@@ -153,6 +407,10 @@ class TextInput:
                 # Only allow numbers and commas
                 if event.unicode.isdigit() or event.unicode == ',':
                     self.text += event.unicode
+            
+            # Re-render only when the text actually changed
+            if self.text != old_text:
+                self.text_surface = font.render(self.text, True, BLACK).convert_alpha()
     
     def draw(self, surface):
         # Draw label
@@ -165,10 +423,23 @@ class TextInput:
         pygame.draw.rect(surface, BLACK, self.rect, 2)
         
         # Draw text
-        text_surface = font.render(self.text, True, BLACK)
-        surface.blit(text_surface, (self.rect.x + 5, self.rect.y + 5))
+        surface.blit(self.text_surface, (self.rect.x + 5, self.rect.y + 5))
+
+@functools.lru_cache(maxsize=None)
+def arrow_sprite(arrow_size):
+    """Downward dropdown arrow, rasterized once per size"""
+    sprite = pygame.Surface((2 * arrow_size + 1, 2 * (arrow_size//2) + 1), pygame.SRCALPHA).convert_alpha()
+    pygame.draw.polygon(sprite, BLACK, [
+        (0, 0),
+        (2 * arrow_size, 0),
+        (arrow_size, 2 * (arrow_size//2))
+    ])
+    return sprite
 
 class Dropdown:
+    __slots__ = ('rect', 'options', 'label', 'selected_index', 'expanded', 'option_height',
+                 'label_surface', 'option_surfaces', 'arrow_surface')
+    
     def __init__(self, x, y, width, height, options, label="", default_index=0):
         self.rect = pygame.Rect(x, y, width, height)
         self.options = options
@@ -176,7 +447,9 @@ class Dropdown:
         self.selected_index = default_index
         self.expanded = False
         self.option_height = height
-        self.label_surface = font.render(label, True, BLACK)
+        self.label_surface = font.render(label, True, BLACK).convert_alpha()
+        self.option_surfaces = [font.render(option, True, BLACK).convert_alpha() for option in options]
+        self.arrow_surface = arrow_sprite(10)
         
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -207,23 +480,17 @@ class Dropdown:
         pygame.draw.rect(surface, WHITE, self.rect)
         pygame.draw.rect(surface, BLACK, self.rect, 2)
         
-        text = self.options[self.selected_index]
-        text_surface = font.render(text, True, BLACK)
+        text_surface = self.option_surfaces[self.selected_index]
         text_rect = text_surface.get_rect(midleft=(self.rect.x + 10, self.rect.y + self.rect.height//2))
         surface.blit(text_surface, text_rect)
         
         # Draw dropdown arrow
         arrow_size = 10
-        arrow_pos = (self.rect.right - 20, self.rect.centery)
-        pygame.draw.polygon(surface, BLACK, [
-            (arrow_pos[0] - arrow_size, arrow_pos[1] - arrow_size//2),
-            (arrow_pos[0] + arrow_size, arrow_pos[1] - arrow_size//2),
-            (arrow_pos[0], arrow_pos[1] + arrow_size//2)
-        ])
+        surface.blit(self.arrow_surface, (self.rect.right - 20 - arrow_size, self.rect.centery - arrow_size//2))
         
         # Draw expanded options
         if self.expanded:
-            for i, option in enumerate(self.options):
+            for i, option_text in enumerate(self.option_surfaces):
                 option_rect = pygame.Rect(
                     self.rect.x, 
                     self.rect.y + (i + 1) * self.option_height, 
@@ -233,7 +500,6 @@ class Dropdown:
                 pygame.draw.rect(surface, WHITE, option_rect)
                 pygame.draw.rect(surface, BLACK, option_rect, 1)
                 
-                option_text = font.render(option, True, BLACK)
                 text_rect = option_text.get_rect(midleft=(option_rect.x + 10, option_rect.y + option_rect.height//2))
                 surface.blit(option_text, text_rect)
                 
@@ -241,6 +507,10 @@ class Dropdown:
         return self.options[self.selected_index]
 
 class Animation:
+    __slots__ = ('start_pos', 'end_pos', 'duration', 'start_time', 'entity_type', 'completed',
+                 'start_pixel', 'end_pixel', 'delta_x', 'delta_y', 'pointer_offset',
+                 'rotation', 'scale', 'alpha', 'p_pos', 'p_vel', 'p_size', 'p_life', 'p_start')
+    
     def __init__(self, start_pos, end_pos, duration=300, entity_type=AGENT):
         self.start_pos = start_pos  # Grid position (row, col)
         self.end_pos = end_pos      # Grid position (row, col)
@@ -250,35 +520,36 @@ class Animation:
         self.completed = False
         
         # Convert grid positions to pixel positions
-        self.start_pixel = (start_pos[1] * TILE_SIZE + TILE_SIZE // 2, 
-                            start_pos[0] * TILE_SIZE + TILE_SIZE // 2)
-        self.end_pixel = (end_pos[1] * TILE_SIZE + TILE_SIZE // 2, 
-                         end_pos[0] * TILE_SIZE + TILE_SIZE // 2)
+        self.start_pixel = TILE_CENTERS[start_pos[0]][start_pos[1]]
+        self.end_pixel = TILE_CENTERS[end_pos[0]][end_pos[1]]
+        self.delta_x = self.end_pixel[0] - self.start_pixel[0]
+        self.delta_y = self.end_pixel[1] - self.start_pixel[1]
+        
+        # Direction indicator offset, a quarter tile along the movement
+        self.pointer_offset = None
+        if self.delta_x != 0 or self.delta_y != 0:
+            norm = math.hypot(self.delta_x, self.delta_y)
+            self.pointer_offset = (self.delta_x / norm * TILE_SIZE // 4, self.delta_y / norm * TILE_SIZE // 4)
         
         # Special effects
         self.rotation = 0
         self.scale = 1.0
         self.alpha = 255
-        self.particles = []
+        self.p_pos = None  # Particle arrays, only allocated for effects that use them
         
         # Special animation for gold collection
         if entity_type == GOLD:
             self.create_particles()
     
     def create_particles(self, count=20):
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 5)
-            size = random.uniform(2, 8)
-            lifetime = random.uniform(500, 1500)
-            self.particles.append({
-                'pos': list(self.start_pixel),
-                'vel': [math.cos(angle) * speed, math.sin(angle) * speed],
-                'size': size,
-                'color': YELLOW,
-                'lifetime': lifetime,
-                'start_time': pygame.time.get_ticks()
-            })
+        # One array per particle attribute, indexed by particle
+        angle = np.random.uniform(0, 2 * math.pi, count)
+        speed = np.random.uniform(1, 5, count)
+        self.p_pos = np.tile(np.array(self.start_pixel, dtype=np.float32), (count, 1))
+        self.p_vel = np.column_stack((np.cos(angle) * speed, np.sin(angle) * speed)).astype(np.float32)
+        self.p_size = np.random.uniform(2, 8, count).astype(np.float32)
+        self.p_life = np.random.uniform(500, 1500, count).astype(np.float32)
+        self.p_start = np.full(count, pygame.time.get_ticks(), dtype=np.float32)
     
     def update(self):
         current_time = pygame.time.get_ticks()
@@ -289,96 +560,106 @@ class Animation:
             return True
         
         # Update particle effects
-        for particle in self.particles:
-            particle_elapsed = current_time - particle['start_time']
-            if particle_elapsed > particle['lifetime']:
-                self.particles.remove(particle)
-                continue
-                
-            # Update particle position
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
+        if self.p_pos is not None and len(self.p_pos):
+            alive = (current_time - self.p_start) <= self.p_life
+            if not alive.all():
+                # Compact away expired particles
+                self.p_pos = self.p_pos[alive]
+                self.p_vel = self.p_vel[alive]
+                self.p_size = self.p_size[alive]
+                self.p_life = self.p_life[alive]
+                self.p_start = self.p_start[alive]
             
-            # Fade out over time
-            particle['color'] = list(particle['color'])
-            fade_factor = 1 - (particle_elapsed / particle['lifetime'])
-            particle['color'][3] = int(255 * fade_factor) if len(particle['color']) > 3 else 255
+            # Update particle positions
+            self.p_pos += self.p_vel
             
         return False
         
     def draw(self, surface):
         current_time = pygame.time.get_ticks()
         elapsed = current_time - self.start_time
-        progress = min(elapsed / self.duration, 1.0)
+        progress_fp = min(elapsed * PROGRESS_ONE // self.duration, PROGRESS_ONE)
+        progress = progress_fp / PROGRESS_ONE  # Float form for the effect curves
         
-        # Calculate current position with easing
-        eased_progress = self.ease_out_quad(progress)
-        current_x = self.start_pixel[0] + (self.end_pixel[0] - self.start_pixel[0]) * eased_progress
-        current_y = self.start_pixel[1] + (self.end_pixel[1] - self.start_pixel[1]) * eased_progress
+        # Calculate current position with easing, in integer pixels
+        eased_fp = self.ease_out_quad(progress_fp)
+        current_x = self.start_pixel[0] + self.delta_x * eased_fp // PROGRESS_ONE
+        current_y = self.start_pixel[1] + self.delta_y * eased_fp // PROGRESS_ONE
         
         # Draw based on entity type
         if self.entity_type == AGENT:
             # Agent animation - blue circle with smooth movement
-            pygame.draw.circle(surface, BLUE, (int(current_x), int(current_y)), int(TILE_SIZE // 3 * (1 + 0.2 * math.sin(progress * math.pi))))
+            pygame.draw.circle(surface, BLUE, (current_x, current_y), int(TILE_THIRD * (1 + 0.2 * math.sin(progress * math.pi))))
             # Draw a direction indicator
-            dir_x = self.end_pixel[0] - self.start_pixel[0]
-            dir_y = self.end_pixel[1] - self.start_pixel[1]
-            if dir_x != 0 or dir_y != 0:
-                norm = math.sqrt(dir_x**2 + dir_y**2)
-                dir_x, dir_y = dir_x/norm, dir_y/norm
+            if self.pointer_offset:
                 pygame.draw.line(surface, BLACK, 
-                                (int(current_x), int(current_y)),
-                                (int(current_x + dir_x * TILE_SIZE//4), int(current_y + dir_y * TILE_SIZE//4)),
+                                (current_x, current_y),
+                                (int(current_x + self.pointer_offset[0]), int(current_y + self.pointer_offset[1])),
                                 3)
         
         elif self.entity_type == GOLD:
             # Gold collection animation - particles and a shrinking gold circle
             # Draw particles
-            for particle in self.particles:
-                pygame.draw.circle(surface, particle['color'], 
-                                  (int(particle['pos'][0]), int(particle['pos'][1])), 
-                                  int(particle['size']))
+            if self.p_pos is not None:
+                # One lock for all particle circles instead of one per circle
+                surface.lock()
+                try:
+                    for center, size in zip(self.p_pos.astype(int).tolist(), self.p_size.astype(int).tolist()):
+                        pygame.draw.circle(surface, YELLOW, center, size)
+                finally:
+                    surface.unlock()
             
             # Draw shrinking gold
             if progress < 0.7:  # Only show during first part of animation
                 size_factor = 1 - progress/0.7
                 pygame.draw.circle(surface, GREEN, 
-                                  (int(current_x), int(current_y)), 
-                                  int(TILE_SIZE // 3 * size_factor))
+                                  (current_x, current_y), 
+                                  int(TILE_THIRD * size_factor))
                 
         elif self.entity_type == TRAP:
             # Trap animation - red flash
             flash_intensity = math.sin(progress * math.pi * 8)  # Quick flashing
             flash_color = (255, max(0, int(255 * (1-flash_intensity))), max(0, int(255 * (1-flash_intensity))))
             pygame.draw.rect(surface, flash_color, 
-                           (int(current_x - TILE_SIZE//3), int(current_y - TILE_SIZE//3),
-                            TILE_SIZE//1.5, TILE_SIZE//1.5))
+                           (current_x - TILE_THIRD, current_y - TILE_THIRD,
+                            TRAP_FLASH_SIZE, TRAP_FLASH_SIZE))
             
         elif self.entity_type == TELEPORT:
             # Teleport animation - circular ripple effect
             for i in range(3):
                 ripple_progress = (progress + i/3) % 1.0
-                radius = TILE_SIZE//2 * ripple_progress
-                width = max(1, int(TILE_SIZE//10 * (1 - ripple_progress)))
+                radius = TILE_HALF * ripple_progress
+                width = max(1, int(TILE_TENTH * (1 - ripple_progress)))
                 pygame.draw.circle(surface, PURPLE, 
-                                 (int(current_x), int(current_y)), 
+                                 (current_x, current_y), 
                                  int(radius), width)
     
-    def ease_out_quad(self, x):
-        return 1 - (1 - x) * (1 - x)
+    def get_rect(self):
+        """Screen area this animation can paint into (start and end tiles plus particles)"""
+        rect = pygame.Rect(self.start_pos[1] * TILE_SIZE, self.start_pos[0] * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        rect.union_ip((self.end_pos[1] * TILE_SIZE, self.end_pos[0] * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+        if self.p_pos is not None and len(self.p_pos):
+            reach = int(self.p_size.max()) + 1
+            low = self.p_pos.min(axis=0).astype(int) - reach
+            high = self.p_pos.max(axis=0).astype(int) + reach
+            rect.union_ip((low[0], low[1], high[0] - low[0], high[1] - low[1]))
+        return rect
+    
+    def ease_out_quad(self, progress_fp):
+        remaining = PROGRESS_ONE - progress_fp
+        return PROGRESS_ONE - remaining * remaining // PROGRESS_ONE
 
 class Level:
+    __slots__ = ('name', 'difficulty', 'size', 'settings', 'agent_pos', 'gold_pos')
+    
     def __init__(self, name, difficulty, size=GRID_SIZE, custom_config=None):
         self.name = name
         self.difficulty = difficulty
         self.size = size
         
-        # Default settings based on difficulty
-        self.settings = DIFFICULTY_SETTINGS[difficulty].copy() if difficulty in DIFFICULTY_SETTINGS else DIFFICULTY_SETTINGS["Medium"].copy()
-        
-        # Custom configuration overrides defaults
-        if custom_config:
-            self.settings.update(custom_config)
+        # Default settings based on difficulty; custom configuration overrides defaults
+        base = DIFFICULTY_SETTINGS.get(difficulty, DIFFICULTY_SETTINGS["Medium"])
+        self.settings = replace(base, **custom_config) if custom_config else base
         
         # Default starting positions
         self.agent_pos = (0, 0)
@@ -386,75 +667,126 @@ class Level:
         
     def generate_grid(self):
         """Generate a grid based on level settings"""
-        grid = [[EMPTY for _ in range(self.size)] for _ in range(self.size)]
+        grid = new_grid(self.size)
         
         # Place agent and gold
-        grid[self.agent_pos[0]][self.agent_pos[1]] = AGENT
-        grid[self.gold_pos[0]][self.gold_pos[1]] = GOLD
+        grid[self.agent_pos] = AGENT
+        grid[self.gold_pos] = GOLD
         
-        # Place wumpuses
+        # Hand out consecutive slices of one random sample to each entity type
+        needed = sum(getattr(self.settings, key) for _, key in PLACEMENT_ORDER)
+        cells = self.sample_empty_cells(grid, needed)
+        offset = 0
         wumpus_positions = []
-        for _ in range(self.settings["wumpus"]):
-            pos = self.find_empty_position(grid, [self.agent_pos, self.gold_pos] + wumpus_positions)
-            if pos:
-                wumpus_positions.append(pos)
-                grid[pos[0]][pos[1]] = WUMPUS
-        
-        # Place pits
-        pit_positions = []
-        for _ in range(self.settings["pits"]):
-            pos = self.find_empty_position(grid, [self.agent_pos, self.gold_pos] + wumpus_positions + pit_positions)
-            if pos:
-                pit_positions.append(pos)
-                grid[pos[0]][pos[1]] = PIT
-        
-        # Place obstacles
-        obstacle_positions = []
-        for _ in range(self.settings["obstacles"]):
-            pos = self.find_empty_position(grid, [self.agent_pos, self.gold_pos] + wumpus_positions + pit_positions + obstacle_positions)
-            if pos:
-                obstacle_positions.append(pos)
-                grid[pos[0]][pos[1]] = OBSTACLE
-        
-        # Place traps
-        trap_positions = []
-        for _ in range(self.settings["traps"]):
-            pos = self.find_empty_position(grid, [self.agent_pos, self.gold_pos] + wumpus_positions + pit_positions + obstacle_positions + trap_positions)
-            if pos:
-                trap_positions.append(pos)
-                grid[pos[0]][pos[1]] = TRAP
-        
-        # Place teleports
-        teleport_positions = []
-        for _ in range(self.settings["teleports"]):
-            pos = self.find_empty_position(grid, [self.agent_pos, self.gold_pos] + wumpus_positions + pit_positions + obstacle_positions + trap_positions + teleport_positions)
-            if pos:
-                teleport_positions.append(pos)
-                grid[pos[0]][pos[1]] = TELEPORT
+        for entity, key in PLACEMENT_ORDER:
+            picks = cells[offset:offset + getattr(self.settings, key)]
+            offset += len(picks)
+            grid.flat[picks] = entity
+            if entity == WUMPUS:
+                wumpus_positions = [divmod(index, self.size) for index in picks]
                 
         return grid, self.agent_pos, self.gold_pos, wumpus_positions
     
-    def find_empty_position(self, grid, exclude_positions):
-        """Find a random empty position that's not in the excluded list"""
-        attempts = 0
-        while attempts < 100:  # Prevent infinite loop
-            row = random.randint(0, self.size-1)
-            col = random.randint(0, self.size-1)
-            
-            if grid[row][col] == EMPTY and (row, col) not in exclude_positions:
-                # Also check that the position isn't adjacent to the agent start
-                if abs(row - self.agent_pos[0]) > 1 or abs(col - self.agent_pos[1]) > 1:
-                    return (row, col)
+    def sample_empty_cells(self, grid, count):
+        """Up to count random flat indices of empty cells, using cells next to the agent start last"""
+        mask = grid == EMPTY
+        near_agent = np.zeros_like(mask)
+        agent_row, agent_col = self.agent_pos
+        near_agent[max(0, agent_row-1):agent_row+2, max(0, agent_col-1):agent_col+2] = True
+        
+        away_cells = np.flatnonzero(mask & ~near_agent)
+        cells = self.sample_indices(away_cells, count)
+        if len(cells) < count:
+            near_cells = np.flatnonzero(mask & near_agent)
+            cells += self.sample_indices(near_cells, count - len(cells))
+        return cells
+    
+    @staticmethod
+    def sample_indices(candidates, count):
+        """Pick up to count entries of a NumPy index array without listing all of them"""
+        # Sampling positions from a range touches only the picked entries, which
+        # keeps generation cheap on large custom maps
+        picks = random.sample(range(len(candidates)), min(count, len(candidates)))
+        return candidates[picks].tolist()
+
+@functools.lru_cache(maxsize=None)
+def tile_surfaces(tile_size):
+    """One opaque tile_size x tile_size surface per entity: white tile, border and symbol"""
+    tiles = {}
+    # Shape offsets are the same for every tile of this size
+    half, third, fifth, sixth, tenth = tile_size//2, tile_size//3, tile_size//5, tile_size//6, tile_size//10
+    three_fifths, four_fifths = tile_size*3//5, tile_size*4//5
+    center = (half, half)
+    for entity in CODE_TO_CHAR:
+        tile = pygame.Surface((tile_size, tile_size)).convert()
+        tile.fill(WHITE)
+        pygame.draw.rect(tile, BLACK, (0, 0, tile_size, tile_size), 1)
+        
+        # Draw entity based on grid value
+        if entity == AGENT:
+            pygame.draw.circle(tile, BLUE, center, third)
+        
+        elif entity == GOLD:
+            pygame.draw.circle(tile, GREEN, center, third)
             
-            attempts += 1
-        
-        # If we couldn't find a position after many attempts, just find any empty space
-        for row in range(self.size):
-            for col in range(self.size):
-                if grid[row][col] == EMPTY and (row, col) not in exclude_positions:
-                    return (row, col)
-        
-        return None  # Grid is full (shouldn't happen)
+            # Draw dollar sign
+            dollar_text = font.render("$", True, BLACK)
+            tile.blit(dollar_text, dollar_text.get_rect(center=center))
+        
+        elif entity == WUMPUS:
+            # Draw wumpus as a red triangle
+            pygame.draw.polygon(tile, RED, [
+                (half, fifth),
+                (fifth, four_fifths),
+                (four_fifths, four_fifths)
+            ])
+        
+        elif entity == PIT:
+            # Draw pit as a black circle
+            pygame.draw.circle(tile, BLACK, center, third)
+        
+        elif entity == OBSTACLE:
+            # Draw obstacle as a brown rectangle
+            pygame.draw.rect(tile, BROWN, (fifth, fifth, three_fifths, three_fifths))
+        
+        elif entity == TRAP:
+            # Draw trap as an orange X
+            pygame.draw.line(tile, ORANGE, (fifth, fifth),
+                             (four_fifths, four_fifths), tenth)
+            pygame.draw.line(tile, ORANGE, (four_fifths, fifth),
+                             (fifth, four_fifths), tenth)
+        
+        elif entity == TELEPORT:
+            # Draw teleport as a purple ring with an inner circle
+            pygame.draw.circle(tile, PURPLE, center, third, 5)
+            pygame.draw.circle(tile, PURPLE, center, sixth)
+        
+        elif entity == TRAIL:
+            # Draw trail as a light blue dot
+            pygame.draw.circle(tile, LIGHT_BLUE, center, sixth)
+        
+        tiles[entity] = tile
+    return tiles
+
+@functools.lru_cache(maxsize=None)
+def tile_atlas(tile_size):
+    """Every entity tile side by side on one surface, plus the source rect of each tile"""
+    tiles = tile_surfaces(tile_size)
+    atlas = pygame.Surface((len(tiles) * tile_size, tile_size)).convert()
+    areas = {}
+    for i, (entity, tile) in enumerate(tiles.items()):
+        atlas.blit(tile, (i * tile_size, 0))
+        areas[entity] = pygame.Rect(i * tile_size, 0, tile_size, tile_size)
+    return atlas, areas
+
+@functools.lru_cache(maxsize=None)
+def empty_grid_surface(rows, cols, tile_size):
+    """A rows x cols grid of empty tiles, rendered once per shape and tile size"""
+    empty = tile_surfaces(tile_size)[EMPTY]
+    surface = pygame.Surface((cols * tile_size, rows * tile_size)).convert()
+    surface.blits([(empty, (col * tile_size, row * tile_size))
+                   for row in range(rows) for col in range(cols)], False)
+    return surface
 
 class GameManager:
     def __init__(self):
@@ -468,10 +800,16 @@ class GameManager:
         self.gold_pos = None
         self.wumpus_positions = []
         self.path = []
+        self.path_cache = OrderedDict()  # (agent, gold, grid bytes) -> path, least recent first
         self.record_gif = False
+        self.gif_queue = None
+        self.gif_thread = None
+        self.last_gif_capture = 0
         self.animation = None
-        self.animations = []
+        self.animations = deque()
         self.teleport_destinations = {}  # Maps teleport positions to destination positions
+        self.teleport_overlay = None  # (surface, offset) of the editor's connection lines
+        self.teleport_overlay_key = None
         self.current_level = None
         self.levels = self.generate_default_levels()
         self.current_level_index = 0
@@ -487,7 +825,33 @@ class GameManager:
         self.show_path_preview = True
         self.game_start_time = 0
         self.game_time_elapsed = 0
-        self.gif_frames = []
+        
+        # Screen regions changed this frame; a full flip is used whenever
+        # full_redraw is set or outside the running game and static screens
+        self.dirty_rects = []
+        self.full_redraw = True
+        self.settings_static = None
+        self.settings_static_speed = None
+        self.stats_static = None
+        self.global_stats_surface = None
+        self.global_stats_key = None
+        self.history_row_cache = {}  # Composed history rows keyed by their cell values
+        self.last_drawn_state = None
+        self.last_animation_rect = None
+        self.drawn_path_preview = None
+        self.path_preview_segments = ()  # Pixel endpoints of each preview line, built per path
+        
+        # Mouse state, sampled once per frame by poll_input(); mouse_clicked is only
+        # set on the frame the left button goes down
+        self.mouse_pos = (0, 0)
+        self.mouse_pressed = False
+        self.mouse_clicked = False
+        
+        # Cached grid tiles without the agent, rebuilt after the grid changes
+        self.grid_background = None
+        self.grid_background_tile_size = None
+        self.game_over_overlay = None
+        self.legend_surface = None
         
         # UI elements
         self.setup_ui()
@@ -500,6 +864,9 @@ class GameManager:
         self.challenge_timer = 0
         self.challenge_interval = 10000  # 10 seconds between changes
         self.challenge_next_change = 0
+        
+        # Weighted A*: 1.0 finds the shortest path, larger values search faster
+        self.heuristic_weight = stats_data["heuristic_weight"]
     
     def generate_default_levels(self):
         """Generate default game levels"""
@@ -567,6 +934,21 @@ class GameManager:
         
         # Settings UI
         self.settings_speed_slider = None  # TODO: Implement slider for animation speed
+        # Built once; option buttons carry their setting value as the action and
+        # only change color when the selection changes
+        self.settings_buttons = {
+            'speed_faster': Button(WIDTH//2, 180, 100, 40, "Faster", GREEN),
+            'speed_slower': Button(WIDTH//2 + 110, 180, 100, 40, "Slower", RED),
+            'preview_on': Button(WIDTH//2, 260, 100, 40, "On", GRAY, True),
+            'preview_off': Button(WIDTH//2 + 110, 260, 100, 40, "Off", GRAY, False),
+            'interval_easy': Button(WIDTH//2 - 120, 340, 100, 40, "Easy", GRAY, 20000),
+            'interval_medium': Button(WIDTH//2, 340, 100, 40, "Medium", GRAY, 10000),
+            'interval_hard': Button(WIDTH//2 + 120, 340, 100, 40, "Hard", GRAY, 5000),
+            'search_exact': Button(WIDTH//2 - 120, 420, 100, 40, "Exact", GRAY, 1.0),
+            'search_fast': Button(WIDTH//2, 420, 100, 40, "Fast", GRAY, 1.5),
+            'search_greedy': Button(WIDTH//2 + 120, 420, 100, 40, "Greedy", GRAY, 2.0),
+            'back': Button(WIDTH//2 - 100, HEIGHT - 80, 200, 50, "Back", RED, MAIN_MENU)
+        }
         
         # Map editor UI elements
         self.map_editor_palette = [
@@ -597,24 +979,60 @@ class GameManager:
         
         # Stats screen UI
         self.stats_back_button = Button(WIDTH//2 - 100, HEIGHT - 80, 200, 50, "Back", RED, MAIN_MENU)
+        self.level_select_back_button = Button(WIDTH//2 - 100, HEIGHT - 80, 200, 50, "Back", RED, MAIN_MENU)
+        self.game_setup_back_button = Button(WIDTH//2 - 100, HEIGHT - 30, 200, 30, "Back", RED, MAIN_MENU)
+        
+        # "Next Level" buttons for the win overlay, built on first use per level index
+        self.next_level_buttons = {}
+    
+    def next_level_button(self):
+        """The win overlay's button leading to the level after the current one"""
+        next_level_index = min(self.current_level_index + 1, len(self.levels) - 1)
+        button = self.next_level_buttons.get(next_level_index)
+        if button is None:
+            button = Button(WIDTH//2 - 150, HEIGHT//2 + 50, 300, 50,
+                            f"Next Level: {self.levels[next_level_index].name}", GREEN, next_level_index)
+            self.next_level_buttons[next_level_index] = button
+        return button
     
     def run(self):
         """Main game loop"""
         running = True
         
         while running:
+            previous_state = self.game_state
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 
                 self.handle_event(event)
+            self.poll_input()
+            if self.game_state != previous_state:
+                # A click that switched screens belongs to the old screen; don't hand it
+                # to the new screen's polled buttons as well
+                self.mouse_clicked = False
             
             self.update()
             self.draw()
+            self.capture_gif_frame()
+            
+            if self.full_redraw or (self.game_state != GAME_RUNNING and self.game_state not in STATIC_SCREEN_STATES):
+                pygame.display.flip()
+            else:
+                pygame.display.update(self.dirty_rects)
+            self.dirty_rects = []
+            self.full_redraw = False
             
-            pygame.display.flip()
+            # Pending stats are written when the screen changes, else at most every STATS_FLUSH_INTERVAL
+            if self.game_state != previous_state:
+                flush_stats()
+            else:
+                flush_stats_if_due(pygame.time.get_ticks())
             self.clock.tick(60)
         
+        # Let the writer thread finish the file; it is a daemon and would be killed mid-write
+        self.save_gif(wait=True)
+        flush_stats()
         pygame.quit()
     
     def handle_event(self, event):
@@ -625,7 +1043,7 @@ class GameManager:
         # Handle keyboard input
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
-                if self.game_state in [GAME_SETUP, MAP_EDITOR, SETTINGS, STATS_SCREEN, LEVEL_SELECT]:
+                if self.game_state in ESCAPE_TO_MENU_STATES:
                     self.game_state = MAIN_MENU
                 elif self.game_state == GAME_RUNNING:
                     self.paused = not self.paused
@@ -649,39 +1067,40 @@ class GameManager:
                 
                 if 0 <= row < GRID_SIZE and 0 <= col < GRID_SIZE:
                     if self.grid is None:
-                        self.grid = [[EMPTY for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+                        self.grid = new_grid()
                     
                     # Place the selected tile type
-                    old_value = self.grid[row][col]
-                    self.grid[row][col] = self.map_editor_selected_tile
+                    old_value = self.grid[row, col]
+                    changed_cells = [(row, col)]
                     
                     # Handle special cases
+                    # There is at most one agent and one gold, so only their
+                    # tracked cell needs clearing (unless it was painted over)
                     if self.map_editor_selected_tile == AGENT:
                         # Remove any existing agent
-                        for r in range(GRID_SIZE):
-                            for c in range(GRID_SIZE):
-                                if (r, c) != (row, col) and self.grid[r][c] == AGENT:
-                                    self.grid[r][c] = EMPTY
+                        if self.agent_pos is not None and self.grid[self.agent_pos] == AGENT:
+                            self.grid[self.agent_pos] = EMPTY
+                            changed_cells.append(self.agent_pos)
                         self.agent_pos = (row, col)
                     
                     elif self.map_editor_selected_tile == GOLD:
                         # Remove any existing gold
-                        for r in range(GRID_SIZE):
-                            for c in range(GRID_SIZE):
-                                if (r, c) != (row, col) and self.grid[r][c] == GOLD:
-                                    self.grid[r][c] = EMPTY
+                        if self.gold_pos is not None and self.grid[self.gold_pos] == GOLD:
+                            self.grid[self.gold_pos] = EMPTY
+                            changed_cells.append(self.gold_pos)
                         self.gold_pos = (row, col)
                     
+                    self.grid[row, col] = self.map_editor_selected_tile
+                    self.redraw_background_cells(changed_cells)
+                    
                     # Handle teleport pairing
                     if self.map_editor_selected_tile == TELEPORT and old_value != TELEPORT:
                         # Find any existing unpaired teleport
                         unpaired = None
-                        for r in range(GRID_SIZE):
-                            for c in range(GRID_SIZE):
-                                if (r, c) != (row, col) and self.grid[r][c] == TELEPORT:
-                                    if (r, c) not in self.teleport_destinations:
-                                        unpaired = (r, c)
-                                        break
+                        for r, c in np.argwhere(self.grid == TELEPORT).tolist():
+                            if (r, c) != (row, col) and (r, c) not in self.teleport_destinations:
+                                unpaired = (r, c)
+                                break
                         
                         if unpaired:
                             # Create bidirectional teleport link
@@ -710,15 +1129,20 @@ class GameManager:
                     self.current_level = self.levels[i]
                     self.initialize_game()
                     self.game_state = GAME_RUNNING
+            
+            if self.level_select_back_button.is_clicked(pos):
+                self.game_state = MAIN_MENU
         
         elif self.game_state == GAME_SETUP:
-            if self.preview_button.is_clicked(pos):
+            if self.game_setup_back_button.is_clicked(pos):
+                self.game_state = MAIN_MENU
+            elif self.preview_button.is_clicked(pos):
                 self.initialize_game(True)  # Just preview
             elif self.start_button.is_clicked(pos):
                 self.initialize_game()
                 self.game_state = GAME_RUNNING
             elif self.gif_button.is_clicked(pos):
-                self.record_gif = True
+                self.start_gif_recording()
                 self.initialize_game()
                 self.game_state = GAME_RUNNING
         
@@ -730,7 +1154,17 @@ class GameManager:
                     elif i == 1:  # Restart Level button
                         self.initialize_game()
                     elif i == 2:  # Main Menu button
+                        if self.record_gif:
+                            self.save_gif()
                         self.game_state = MAIN_MENU
+            
+            # Next level button on the win overlay
+            if self.game_won and self.current_level:
+                next_button = self.next_level_button()
+                if next_button.is_clicked(pos):
+                    self.current_level_index = next_button.action
+                    self.current_level = self.levels[next_button.action]
+                    self.initialize_game()
         
         elif self.game_state == MAP_EDITOR:
             # Handle map editor palette clicks
@@ -742,11 +1176,12 @@ class GameManager:
             for i, button in enumerate(self.map_editor_buttons):
                 if button.is_clicked(pos):
                     if i == 0:  # Clear Map
-                        self.grid = [[EMPTY for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+                        self.grid = new_grid()
                         self.agent_pos = (0, 0)
-                        self.grid[0][0] = AGENT
+                        self.grid[self.agent_pos] = AGENT
                         self.gold_pos = (GRID_SIZE-1, GRID_SIZE-1)
-                        self.grid[GRID_SIZE-1][GRID_SIZE-1] = GOLD
+                        self.grid[self.gold_pos] = GOLD
+                        self.grid_background = None
                         self.teleport_destinations = {}
                     elif i == 1:  # Save Map
                         self.save_custom_map()
@@ -769,15 +1204,18 @@ class GameManager:
         """Save the current map to a file"""
         try:
             custom_map = {
-                "grid": self.grid,
+                "version": MAP_FORMAT_VERSION,
+                "grid": grid_to_chars(self.grid),
                 "agent_pos": self.agent_pos,
                 "gold_pos": self.gold_pos,
-                "teleport_destinations": self.teleport_destinations
+                # JSON objects only take string keys, so links are stored as [source, destination] pairs
+                "teleport_destinations": [[source, destination] for source, destination
+                                          in self.teleport_destinations.items()]
             }
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"custom_map_{timestamp}.json"
             with open(filename, 'w') as f:
-                json.dump(custom_map, f)
+                json.dump(custom_map, f, separators=(",", ":"))
             print(f"Map saved as {filename}")
         except Exception as e:
             print(f"Error saving map: {e}")
@@ -793,14 +1231,20 @@ class GameManager:
                 latest_map = max(map_files)
                 with open(latest_map, 'r') as f:
                     custom_map = json.load(f)
-                self.grid = custom_map["grid"] 
+                self.grid = chars_to_grid(custom_map["grid"])
+                self.grid_background = None
                 self.agent_pos = tuple(custom_map["agent_pos"])
                 self.gold_pos = tuple(custom_map["gold_pos"])
                 
-                # Convert string keys back to tuples for teleport_destinations
-                teleport_dict = {}
-                for k, v in custom_map["teleport_destinations"].items():
-                    teleport_dict[eval(k) if isinstance(k, str) else tuple(k)] = tuple(v)
+                # Convert the stored links back to a tuple -> tuple dict
+                teleports = custom_map["teleport_destinations"]
+                if custom_map.get("version", 1) >= 2 or isinstance(teleports, list):
+                    teleport_dict = {tuple(source): tuple(destination) for source, destination in teleports}
+                else:
+                    # Version 1 maps stored a dict keyed by "(row, col)" strings
+                    teleport_dict = {}
+                    for k, v in teleports.items():
+                        teleport_dict[tuple(ast.literal_eval(k)) if isinstance(k, str) else tuple(k)] = tuple(v)
                 self.teleport_destinations = teleport_dict
                 
                 print(f"Loaded map from {latest_map}")
@@ -811,11 +1255,12 @@ class GameManager:
     
     def initialize_map_editor(self):
         """Initialize the map editor with a blank grid"""
-        self.grid = [[EMPTY for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.grid = new_grid()
         self.agent_pos = (0, 0)
-        self.grid[0][0] = AGENT
+        self.grid[self.agent_pos] = AGENT
         self.gold_pos = (GRID_SIZE-1, GRID_SIZE-1)
-        self.grid[GRID_SIZE-1][GRID_SIZE-1] = GOLD
+        self.grid[self.gold_pos] = GOLD
+        self.grid_background = None
         self.teleport_destinations = {}
         self.map_editor_selected_tile = EMPTY
     
@@ -823,7 +1268,7 @@ class GameManager:
         """Initialize a new game based on current settings"""
         # Reset game variables
         self.path = []
-        self.animations = []
+        self.animations = deque()
         self.animation = None
         self.game_over = False
         self.game_won = False
@@ -831,7 +1276,6 @@ class GameManager:
         self.score = 0
         self.gold_collected = 0
         self.game_time_elapsed = 0
-        self.gif_frames = []
         
         # Get positions from input fields or generate a new level
         if self.game_state == GAME_SETUP:
@@ -853,16 +1297,14 @@ class GameManager:
             # Generate grid based on difficulty
             self.difficulty = self.difficulty_dropdown.get_selected()
             level = Level("Custom", self.difficulty, GRID_SIZE)
-            self.grid, _, _, self.wumpus_positions = level.generate_grid()
+            self.grid, level_agent_pos, level_gold_pos, self.wumpus_positions = level.generate_grid()
             
-            # Override the agent and gold positions
-            for r in range(GRID_SIZE):
-                for c in range(GRID_SIZE):
-                    if self.grid[r][c] in [AGENT, GOLD]:
-                        self.grid[r][c] = EMPTY
+            # Override the agent and gold positions; generate_grid placed exactly one of each
+            self.grid[level_agent_pos] = EMPTY
+            self.grid[level_gold_pos] = EMPTY
             
-            self.grid[self.agent_pos[0]][self.agent_pos[1]] = AGENT
-            self.grid[self.gold_pos[0]][self.gold_pos[1]] = GOLD
+            self.grid[self.agent_pos] = AGENT
+            self.grid[self.gold_pos] = GOLD
             
         elif self.current_level:
             # Use the selected level
@@ -883,94 +1325,47 @@ class GameManager:
         
         # Start game timer
         self.game_start_time = pygame.time.get_ticks()
+        self.grid_background = None
+        self.full_redraw = True
         
         if not preview_only and not self.game_state == MAP_EDITOR:
             # Record game start for statistics
             stats_data["games_played"] += 1
-            save_stats()
+            mark_stats_dirty()
     
     def initialize_teleports(self):
         """Create random teleport destination pairs"""
         self.teleport_destinations = {}
-        teleport_positions = []
         
         # Find all teleport positions
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
-                if self.grid[r][c] == TELEPORT:
-                    teleport_positions.append((r, c))
-        
-        # Create random pairs
-        random.shuffle(teleport_positions)
-        for i in range(0, len(teleport_positions), 2):
-            if i + 1 < len(teleport_positions):
-                self.teleport_destinations[teleport_positions[i]] = teleport_positions[i+1]
-                self.teleport_destinations[teleport_positions[i+1]] = teleport_positions[i]
+        coords = np.argwhere(self.grid == TELEPORT)
+        
+        # Create random pairs; an odd teleport out stays unpaired
+        pair_count = len(coords) // 2
+        paired = coords[np.random.permutation(len(coords))[:pair_count * 2]].reshape(pair_count, 2, 2)
+        for first, second in paired.tolist():
+            first, second = tuple(first), tuple(second)
+            self.teleport_destinations[first] = second
+            self.teleport_destinations[second] = first
     
     def calculate_path(self):
         """Calculate best path from agent to gold using A*"""
-        if not self.agent_pos or not self.gold_pos or not self.grid:
+        if not self.agent_pos or not self.gold_pos or self.grid is None:
             return []
         
-        # A* algorithm implementation
-        def heuristic(a, b):
-            return abs(a[0] - b[0]) + abs(a[1] - b[1])  # Manhattan distance
-        
-        def get_neighbors(pos):
-            row, col = pos
-            neighbors = []
-            
-            # Check four directions
-            for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                r, c = row + dr, col + dc
-                
-                if 0 <= r < GRID_SIZE and 0 <= c < GRID_SIZE:
-                    # Check if it's a valid move
-                    if self.grid[r][c] not in [OBSTACLE, WUMPUS]:
-                        neighbors.append((r, c))
-            
-            return neighbors
-        
-        # Initialize A* variables
-        open_set = [(0, self.agent_pos)]  # Priority queue (f_score, pos)
-        came_from = {}
-        g_score = {self.agent_pos: 0}
-        f_score = {self.agent_pos: heuristic(self.agent_pos, self.gold_pos)}
+        # The agent consumes self.path as it moves, so hand out copies of cached paths
+        key = (self.agent_pos, self.gold_pos, self.heuristic_weight, self.grid.tobytes())
+        cached = self.path_cache.get(key)
+        if cached is not None:
+            self.path_cache.move_to_end(key)
+        else:
+            cached = find_path(self.grid, self.agent_pos, self.gold_pos, self.heuristic_weight)
+            self.path_cache[key] = cached
+            if len(self.path_cache) > PATH_CACHE_SIZE:
+                self.path_cache.popitem(last=False)
         
-        while open_set:
-            _, current = min(open_set, key=lambda x: x[0])
-            open_set = [x for x in open_set if x[1] != current]
-            
-            if current == self.gold_pos:
-                # Reconstruct path
-                path = []
-                while current in came_from:
-                    path.append(current)
-                    current = came_from[current]
-                path.append(self.agent_pos)
-                path.reverse()
-                self.path = path
-                return path
-            
-            for neighbor in get_neighbors(current):
-                # Special case for teleport - adjust g_score
-                teleport_penalty = 0
-                if self.grid[neighbor[0]][neighbor[1]] == TELEPORT:
-                    # Add a small penalty for teleports to avoid teleport loops
-                    teleport_penalty = 1
-                
-                tentative_g = g_score[current] + 1 + teleport_penalty
-                
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + heuristic(neighbor, self.gold_pos)
-                    if not any(neighbor == x[1] for x in open_set):
-                        open_set.append((f_score[neighbor], neighbor))
-        
-        # No path found
-        self.path = []
-        return []
+        self.path = cached[:]
+        return self.path
     
     def update(self):
         """Update game state"""
@@ -990,65 +1385,68 @@ class GameManager:
             if self.animations:
                 # Check if current animation is completed
                 if not self.animation:
-                    self.animation = self.animations.pop(0)
+                    self.animation = self.animations.popleft()
                 
                 if self.animation.update():
                     # Animation completed
                     if self.animation.entity_type == AGENT:
                         # Update agent position
                         new_pos = self.animation.end_pos
-                        self.grid[self.agent_pos[0]][self.agent_pos[1]] = TRAIL
+                        trail_pos = self.agent_pos
+                        self.grid[trail_pos] = TRAIL
+                        self.dirty_rects.append(self.animation.get_rect())
                         self.agent_pos = new_pos
                         
                         # Check what's at the new position
-                        entity_at_pos = self.grid[new_pos[0]][new_pos[1]]
+                        entity_at_pos = self.grid[new_pos]
                         
                         if entity_at_pos == GOLD:
                             # Collected gold
                             self.gold_collected += 1
                             stats_data["gold_collected"] += 1
-                            save_stats()
+                            mark_stats_dirty()
                             
                             # Add gold collection animation
-                            self.animations.insert(0, Animation(new_pos, new_pos, 500, GOLD))
+                            self.animations.appendleft(Animation(new_pos, new_pos, 500, GOLD))
                             
                             # Update score
                             self.score += 1000 - self.steps_taken * 10
                             if self.score > stats_data["best_score"]:
                                 stats_data["best_score"] = self.score
-                                save_stats()
+                                mark_stats_dirty()
                                 
                             # Set game win state
                             self.game_won = True
                         
-                        elif entity_at_pos == WUMPUS or entity_at_pos == PIT:
+                        elif entity_at_pos & DEADLY:
                             # Game over - died
                             stats_data["deaths"] += 1
-                            save_stats()
+                            mark_stats_dirty()
                             self.game_over = True
                         
                         elif entity_at_pos == TRAP:
                             # Trap effect - lose points
                             self.score -= 100
                             # Add trap animation
-                            self.animations.insert(0, Animation(new_pos, new_pos, 500, TRAP))
+                            self.animations.appendleft(Animation(new_pos, new_pos, 500, TRAP))
                         
                         elif entity_at_pos == TELEPORT:
                             # Teleport to paired location
                             if new_pos in self.teleport_destinations:
                                 dest_pos = self.teleport_destinations[new_pos]
                                 # Add teleport animation
-                                self.animations.insert(0, Animation(new_pos, new_pos, 500, TELEPORT))
+                                self.animations.appendleft(Animation(new_pos, new_pos, 500, TELEPORT))
                                 # Add movement animation to destination
                                 self.animations.insert(1, Animation(new_pos, dest_pos, self.animation_speed, AGENT))
                         
                         # Place agent at new position
-                        self.grid[new_pos[0]][new_pos[1]] = AGENT
+                        self.grid[new_pos] = AGENT
+                        self.redraw_background_cells((trail_pos, new_pos))
                         
                         # Update stats
                         self.steps_taken += 1
                         stats_data["total_steps"] += 1
-                        save_stats()
+                        mark_stats_dirty()
                     
                     # Clear the completed animation
                     self.animation = None
@@ -1063,7 +1461,8 @@ class GameManager:
                             stats_data["levels_completed"][level_key] += 1
                             
                             # Record best path
-                            if self.steps_taken < stats_data["best_path_length"]:
+                            best_path_length = stats_data["best_path_length"]
+                            if best_path_length is None or self.steps_taken < best_path_length:
                                 stats_data["best_path_length"] = self.steps_taken
                             
                             # Add to history
@@ -1076,10 +1475,13 @@ class GameManager:
                                 "time": self.game_time_elapsed // 1000,  # seconds
                                 "result": "won" if self.game_won else "lost"
                             })
-                            save_stats()
+                            mark_stats_dirty()
+                        
+                        # A finished game is worth writing out right away
+                        flush_stats()
                         
                         # Save GIF if recording
-                        if self.record_gif and self.gif_frames:
+                        if self.record_gif:
                             self.save_gif()
             
             # Start next animation if path exists and no current animation
@@ -1088,12 +1490,6 @@ class GameManager:
                     current_pos = self.path.pop(0)
                     next_pos = self.path[0]
                     self.animations.append(Animation(current_pos, next_pos, self.animation_speed, AGENT))
-            
-            # Capture frame for GIF if recording
-            if self.record_gif:
-                surface_copy = self.screen.copy()
-                pygame_surface_to_pil = pygame.surfarray.array3d(surface_copy).swapaxes(0, 1)
-                self.gif_frames.append(pygame_surface_to_pil)
     
     def apply_challenge_update(self):
         """Apply random changes for challenge mode"""
@@ -1102,12 +1498,12 @@ class GameManager:
         if change_type == "move_wumpus" and self.wumpus_positions:
             # Move a random wumpus
             wumpus_pos = random.choice(self.wumpus_positions)
-            self.grid[wumpus_pos[0]][wumpus_pos[1]] = EMPTY
+            self.grid[wumpus_pos] = EMPTY
             
             # Find a new empty position
             new_pos = self.find_empty_position()
             if new_pos:
-                self.grid[new_pos[0]][new_pos[1]] = WUMPUS
+                self.grid[new_pos] = WUMPUS
                 self.wumpus_positions.remove(wumpus_pos)
                 self.wumpus_positions.append(new_pos)
         
@@ -1115,60 +1511,125 @@ class GameManager:
             # Add a new pit
             new_pos = self.find_empty_position()
             if new_pos:
-                self.grid[new_pos[0]][new_pos[1]] = PIT
+                self.grid[new_pos] = PIT
         
         elif change_type == "add_trap":
             # Add a new trap
             new_pos = self.find_empty_position()
             if new_pos:
-                self.grid[new_pos[0]][new_pos[1]] = TRAP
+                self.grid[new_pos] = TRAP
         
         # Recalculate path after changes
         self.calculate_path()
+        self.grid_background = None
+        self.full_redraw = True
     
     def find_empty_position(self):
         """Find a random empty position that's not near the agent or gold"""
         safe_distance = 2  # Minimum distance from agent
-        attempts = 0
         
-        while attempts < 100:  # Prevent infinite loop
-            row = random.randint(0, GRID_SIZE-1)
-            col = random.randint(0, GRID_SIZE-1)
-            
-            # Check if position is empty and far enough from agent
-            if (self.grid[row][col] == EMPTY and
-                abs(row - self.agent_pos[0]) > safe_distance and
-                abs(col - self.agent_pos[1]) > safe_distance):
-                return (row, col)
-            
-            attempts += 1
+        # Empty cells whose row and column are both far enough from the agent
+        lines = np.arange(GRID_SIZE)
+        row_mask = np.abs(lines - self.agent_pos[0]) > safe_distance
+        col_mask = np.abs(lines - self.agent_pos[1]) > safe_distance
+        valid = np.argwhere((self.grid == EMPTY) & row_mask[:, None] & col_mask[None, :])
         
-        return None
+        if not len(valid):
+            return None
+        return tuple(valid[random.randrange(len(valid))].tolist())
+    
+    def start_gif_recording(self):
+        """Start a background thread that encodes captured frames into a GIF"""
+        if self.record_gif:
+            self.save_gif()
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"wumpus_game_{timestamp}.gif"
+        
+        self.gif_queue = queue.Queue(maxsize=GIF_QUEUE_SIZE)
+        self.last_gif_capture = 0
+        self.record_gif = True
+        self.gif_thread = threading.Thread(target=self.gif_writer_loop, args=(self.gif_queue, filename), daemon=True)
+        self.gif_thread.start()
     
-    def save_gif(self):
-        """Save recorded game as a GIF"""
+    def capture_gif_frame(self):
+        """Queue the frame just drawn if recording and a capture is due"""
+        if not self.record_gif or self.game_state != GAME_RUNNING or self.paused:
+            return
+        current_time = pygame.time.get_ticks()
+        if current_time - self.last_gif_capture < 1000 // GIF_FPS:
+            return
+        self.last_gif_capture = current_time
+        
+        # tobytes copies the pixels straight into row-major RGB, the layout the writer
+        # wants, without a temporary surface or a transposed array
+        width, height = self.screen.get_size()
+        frame = np.frombuffer(pygame.image.tobytes(self.screen, "RGB"), dtype=np.uint8).reshape(height, width, 3)
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"wumpus_game_{timestamp}.gif"
-            
-            if self.gif_frames:
-                # Convert pygame surfaces to PIL images
-                pil_frames = [pygame.surfarray.array3d(frame).swapaxes(0, 1) for frame in self.gif_frames]
-                
-                # Save as GIF
-                imageio.mimsave(filename, pil_frames, fps=10)
-                print(f"GIF saved as {filename}")
+            self.gif_queue.put_nowait(frame)
+        except queue.Full:
+            pass  # Writer is behind; drop the frame rather than stall the game
+    
+    def gif_writer_loop(self, frames, filename):
+        """Append queued frames to the GIF until the None sentinel arrives"""
+        writer = None
+        try:
+            # bits palettizes each frame as it arrives, so the frames imageio holds
+            # until close take one byte per pixel instead of three. Pillow already
+            # stores each frame as just the rectangle that changed since the last one.
+            writer = imageio.get_writer(filename, mode='I', fps=GIF_FPS, bits=GIF_PALETTE_BITS)
         except Exception as e:
             print(f"Error saving GIF: {e}")
         
+        # Keep draining even after an error so the game never blocks on a full queue
+        while True:
+            frame = frames.get()
+            if frame is None:
+                break
+            if writer is None:
+                continue
+            try:
+                writer.append_data(frame)
+            except Exception as e:
+                print(f"Error saving GIF: {e}")
+                writer.close()
+                writer = None
+        
+        if writer is not None:
+            writer.close()
+            print(f"GIF saved as {filename}")
+    
+    def save_gif(self, wait=False):
+        """Finish the recorded GIF; the writer thread closes the file, optionally waited for"""
+        if self.gif_queue is not None:
+            self.gif_queue.put(None)
+            self.gif_queue = None
+        
+        if wait and self.gif_thread is not None:
+            self.gif_thread.join()
+            self.gif_thread = None
+        
         # Reset recording
         self.record_gif = False
-        self.gif_frames = []
+    
+    def poll_input(self):
+        """Read the mouse once per frame; every hover and click check uses this sample"""
+        self.mouse_pos = pygame.mouse.get_pos()
+        pressed = pygame.mouse.get_pressed()[0]
+        self.mouse_clicked = pressed and not self.mouse_pressed
+        self.mouse_pressed = pressed
     
     def draw(self):
         """Draw the game based on current state"""
-        self.screen = pygame.display.set_mode((GAME_SCREEN_WIDTH, HEIGHT)) if self.game_state == GAME_RUNNING else pygame.display.set_mode((WIDTH, HEIGHT))
-        self.screen.fill(WHITE)
+        if self.game_state != self.last_drawn_state:
+            self.full_redraw = True
+            self.last_drawn_state = self.game_state
+            # Only the running game has the sidebar; resize the window on transitions only
+            size = (GAME_SCREEN_WIDTH, HEIGHT) if self.game_state == GAME_RUNNING else (WIDTH, HEIGHT)
+            if self.screen.get_size() != size:
+                self.screen = pygame.display.set_mode(size)
+        if self.game_state not in STATIC_SCREEN_STATES:
+            # Static screens cover the whole window with their cached surface
+            self.screen.fill(WHITE)
         
         if self.game_state == MAIN_MENU:
             self.draw_main_menu()
@@ -1188,45 +1649,40 @@ class GameManager:
     def draw_main_menu(self):
         """Draw the main menu screen"""
         # Draw title
-        title_text = title_font.render("Wumpus World AI Game", True, BLACK)
+        title_text = render_text(title_font, "Wumpus World AI Game")
         title_rect = title_text.get_rect(center=(WIDTH//2, 100))
         self.screen.blit(title_text, title_rect)
         
         # Draw menu buttons
-        for button in self.main_menu_buttons:
-            button.draw(self.screen)
+        draw_buttons(self.screen, self.main_menu_buttons, self.mouse_pos)
         
         # Draw footer
-        version_text = small_font.render("v1.0 - AI Pathfinding Demo", True, BLACK)
+        version_text = render_text(small_font, "v1.0 - AI Pathfinding Demo")
         version_rect = version_text.get_rect(midbottom=(WIDTH//2, HEIGHT - 20))
         self.screen.blit(version_text, version_rect)
     
     def draw_level_select(self):
         """Draw the level selection screen"""
         # Draw title
-        title_text = title_font.render("Select Level", True, BLACK)
+        title_text = render_text(title_font, "Select Level")
         title_rect = title_text.get_rect(center=(WIDTH//2, 80))
         self.screen.blit(title_text, title_rect)
         
         # Draw level buttons
-        for button in self.level_buttons:
-            button.draw(self.screen)
+        draw_buttons(self.screen, self.level_buttons, self.mouse_pos)
         
         # Back button
-        back_button = Button(WIDTH//2 - 100, HEIGHT - 80, 200, 50, "Back", RED, MAIN_MENU)
-        back_button.draw(self.screen)
-        if back_button.is_clicked(pygame.mouse.get_pos()):
-            self.game_state = MAIN_MENU
+        self.level_select_back_button.draw(self.screen, self.mouse_pos)
     
     def draw_game_setup(self):
         """Draw the game setup screen"""
         # Draw title
-        title_text = title_font.render("Game Setup", True, BLACK)
+        title_text = render_text(title_font, "Game Setup")
         title_rect = title_text.get_rect(center=(WIDTH//2, 80))
         self.screen.blit(title_text, title_rect)
         
         # Draw difficulty selector
-        difficulty_label = font.render("Select Difficulty:", True, BLACK)
+        difficulty_label = render_text(font, "Select Difficulty:")
         self.screen.blit(difficulty_label, (WIDTH//2 - 150, 120))
         self.difficulty_dropdown.draw(self.screen)
         
@@ -1235,16 +1691,13 @@ class GameManager:
         self.gold_input.draw(self.screen)
         
         # Draw buttons
-        self.preview_button.draw(self.screen)
-        self.start_button.draw(self.screen)
-        self.gif_button.draw(self.screen)
+        draw_buttons(self.screen, [self.preview_button, self.start_button, self.gif_button], self.mouse_pos)
         
         # Draw back button
-        back_button = Button(WIDTH//2 - 100, HEIGHT - 30, 200, 30, "Back", RED, MAIN_MENU)
-        back_button.draw(self.screen)
+        self.game_setup_back_button.draw(self.screen, self.mouse_pos)
         
         # Draw preview grid if available
-        if self.grid:
+        if self.grid is not None:
             # Scale down and center the grid for preview
             preview_size = min(WIDTH, HEIGHT) - 300
             tile_size = preview_size // GRID_SIZE
@@ -1255,15 +1708,20 @@ class GameManager:
             
             # Draw path if preview requested
             if self.show_path_preview and self.path:
-                for i, pos in enumerate(self.path):
-                    if i < len(self.path) - 1:
-                        next_pos = self.path[i+1]
-                        start_x = offset_x + pos[1] * tile_size + tile_size // 2
-                        start_y = offset_y + pos[0] * tile_size + tile_size // 2
-                        end_x = offset_x + next_pos[1] * tile_size + tile_size // 2
-                        end_y = offset_y + next_pos[0] * tile_size + tile_size // 2
-                        
-                        pygame.draw.line(self.screen, BLUE, (start_x, start_y), (end_x, end_y), 3)
+                # Hold the surface lock once across the whole batch of line draws
+                self.screen.lock()
+                try:
+                    for i, pos in enumerate(self.path):
+                        if i < len(self.path) - 1:
+                            next_pos = self.path[i+1]
+                            start_x = offset_x + pos[1] * tile_size + tile_size // 2
+                            start_y = offset_y + pos[0] * tile_size + tile_size // 2
+                            end_x = offset_x + next_pos[1] * tile_size + tile_size // 2
+                            end_y = offset_y + next_pos[0] * tile_size + tile_size // 2
+                            
+                            pygame.draw.line(self.screen, BLUE, (start_x, start_y), (end_x, end_y), 3)
+                finally:
+                    self.screen.unlock()
     
     def draw_game(self):
         """Draw the game screen with grid and UI"""
@@ -1273,10 +1731,10 @@ class GameManager:
         # Draw sidebar background
         sidebar_rect = pygame.Rect(WIDTH, 0, SIDEBAR_WIDTH, HEIGHT)
         pygame.draw.rect(self.screen, LIGHT_BLUE, sidebar_rect)
+        self.dirty_rects.append(sidebar_rect)
         
         # Draw UI buttons
-        for button in self.game_ui_buttons:
-            button.draw(self.screen)
+        draw_buttons(self.screen, self.game_ui_buttons, self.mouse_pos)
         
         # Draw game info
         info_y = 180
@@ -1288,55 +1746,52 @@ class GameManager:
             f"Time: {self.game_time_elapsed // 1000}s"
         ]
         
+        sidebar_blits = []
         for text in info_texts:
-            text_surface = font.render(text, True, BLACK)
-            self.screen.blit(text_surface, (WIDTH + 20, info_y))
+            sidebar_blits.append((render_text(font, text), (WIDTH + 20, info_y)))
             info_y += 40
         
-        # Draw legend
-        legend_y = info_y + 40
-        legend_title = font.render("Legend:", True, BLACK)
-        self.screen.blit(legend_title, (WIDTH + 20, legend_y))
-        legend_y += 30
-        
-        legend_items = [
-            (AGENT, BLUE, "Agent"),
-            (GOLD, GREEN, "Gold"),
-            (WUMPUS, RED, "Wumpus"),
-            (PIT, BLACK, "Pit"),
-            (OBSTACLE, BROWN, "Obstacle"),
-            (TRAP, ORANGE, "Trap"),
-            (TELEPORT, PURPLE, "Teleport")
-        ]
-        
-        for entity, color, label in legend_items:
-            pygame.draw.rect(self.screen, color, (WIDTH + 20, legend_y, 30, 30))
-            pygame.draw.rect(self.screen, BLACK, (WIDTH + 20, legend_y, 30, 30), 1)
-            text_surface = small_font.render(label, True, BLACK)
-            self.screen.blit(text_surface, (WIDTH + 60, legend_y + 8))
-            legend_y += 40
+        # Draw legend, together with the info lines in one blits call
+        if self.legend_surface is None:
+            self.legend_surface = self.render_legend()
+        sidebar_blits.append((self.legend_surface, (WIDTH, info_y + 40)))
+        self.screen.blits(sidebar_blits, False)
+        
+        # Showing, hiding or shortening the path touches tiles all over the grid
+        path_preview = tuple(self.path) if self.show_path_preview and self.path and not self.animation else None
+        if path_preview != self.drawn_path_preview:
+            self.full_redraw = True
+            self.drawn_path_preview = path_preview
+            # Line endpoints come straight from the tile-center table, once per path
+            centers = [TILE_CENTERS[row][col] for row, col in path_preview] if path_preview else []
+            self.path_preview_segments = tuple(zip(centers, centers[1:]))
         
         # Draw path if showing preview
-        if self.show_path_preview and self.path and not self.animation:
-            for i, pos in enumerate(self.path):
-                if i < len(self.path) - 1:
-                    next_pos = self.path[i+1]
-                    start_x = pos[1] * TILE_SIZE + TILE_SIZE // 2
-                    start_y = pos[0] * TILE_SIZE + TILE_SIZE // 2
-                    end_x = next_pos[1] * TILE_SIZE + TILE_SIZE // 2
-                    end_y = next_pos[0] * TILE_SIZE + TILE_SIZE // 2
-                    
-                    pygame.draw.line(self.screen, BLUE, (start_x, start_y), (end_x, end_y), 3)
-        
-        # Draw current animation
+        if path_preview:
+            # Hold the surface lock once across the whole batch of line draws
+            self.screen.lock()
+            try:
+                for start, end in self.path_preview_segments:
+                    pygame.draw.line(self.screen, BLUE, start, end, 3)
+            finally:
+                self.screen.unlock()
+        
+        # Draw current animation, refreshing where it is now and where it was last frame
+        if self.last_animation_rect:
+            self.dirty_rects.append(self.last_animation_rect)
+        self.last_animation_rect = None
         if self.animation:
             self.animation.draw(self.screen)
+            self.last_animation_rect = self.animation.get_rect()
+            self.dirty_rects.append(self.last_animation_rect)
         
         # Draw game over / won message
         if self.game_over or self.game_won:
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))
-            self.screen.blit(overlay, (0, 0))
+            self.full_redraw = True
+            if self.game_over_overlay is None:
+                self.game_over_overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA).convert_alpha()
+                self.game_over_overlay.fill((0, 0, 0, 128))
+            self.screen.blit(self.game_over_overlay, (0, 0))
             
             if self.game_won:
                 message = "You Won!"
@@ -1345,30 +1800,22 @@ class GameManager:
                 message = "Game Over"
                 color = RED
                 
-            text = title_font.render(message, True, color)
+            text = render_text(title_font, message, color)
             text_rect = text.get_rect(center=(WIDTH//2, HEIGHT//2 - 50))
             self.screen.blit(text, text_rect)
             
-            score_text = font.render(f"Score: {self.score}   Steps: {self.steps_taken}", True, WHITE)
+            score_text = render_text(font, f"Score: {self.score}   Steps: {self.steps_taken}", WHITE)
             score_rect = score_text.get_rect(center=(WIDTH//2, HEIGHT//2))
             self.screen.blit(score_text, score_rect)
             
             # Draw next level button if won
             if self.game_won and self.current_level:
-                    next_level_index = min(self.current_level_index + 1, len(self.levels) - 1)
-                    next_button = Button(WIDTH//2 - 150, HEIGHT//2 + 50, 300, 50, 
-                                      f"Next Level: {self.levels[next_level_index].name}", GREEN)
-                    next_button.draw(self.screen)
-                    
-                    if pygame.mouse.get_pressed()[0] and next_button.is_clicked(pygame.mouse.get_pos()):
-                        self.current_level_index = next_level_index
-                        self.current_level = self.levels[next_level_index]
-                        self.initialize_game()
+                self.next_level_button().draw(self.screen, self.mouse_pos)
     
     def draw_map_editor(self):
         """Draw the map editor screen"""
         # Draw title
-        title_text = title_font.render("Map Editor", True, BLACK)
+        title_text = render_text(title_font, "Map Editor")
         title_rect = title_text.get_rect(center=(WIDTH//2, 30))
         self.screen.blit(title_text, title_rect)
         
@@ -1376,115 +1823,135 @@ class GameManager:
         self.draw_grid(0, 0, TILE_SIZE)
         
         # Draw palette
-        palette_text = font.render("Tile Palette:", True, BLACK)
+        palette_text = render_text(font, "Tile Palette:")
         self.screen.blit(palette_text, (20, HEIGHT - 230))
         
+        draw_buttons(self.screen, self.map_editor_palette, self.mouse_pos)
+        
+        # Highlight selected tile
         for button in self.map_editor_palette:
-            button.draw(self.screen)
-            
-            # Highlight selected tile
             if button.action == self.map_editor_selected_tile:
                 pygame.draw.rect(self.screen, BLUE, button.rect, 3)
         
         # Draw action buttons
-        for button in self.map_editor_buttons:
-            button.draw(self.screen)
+        draw_buttons(self.screen, self.map_editor_buttons, self.mouse_pos)
         
         # Draw instructions
-        info_text = small_font.render("Click on the grid to place selected tile type", True, BLACK)
+        info_text = render_text(small_font, "Click on the grid to place selected tile type")
         self.screen.blit(info_text, (20, HEIGHT - 170))
         
-        # Draw teleport connections if any
+        # Draw teleport connections if any; the lines are re-rendered only when the pairs change
+        overlay_key = tuple(self.teleport_destinations.items())
+        if overlay_key != self.teleport_overlay_key:
+            self.teleport_overlay = self.render_teleport_overlay()
+            self.teleport_overlay_key = overlay_key
+        if self.teleport_overlay:
+            self.screen.blit(*self.teleport_overlay)
+    
+    def render_teleport_overlay(self):
+        """Transparent surface holding every teleport connection line, cropped to their bounds"""
+        if not self.teleport_destinations:
+            return None
+        lines = []
         for pos, dest in self.teleport_destinations.items():
             start_x = pos[1] * TILE_SIZE + TILE_SIZE // 2
             start_y = pos[0] * TILE_SIZE + TILE_SIZE // 2
             end_x = dest[1] * TILE_SIZE + TILE_SIZE // 2
             end_y = dest[0] * TILE_SIZE + TILE_SIZE // 2
-            
-            pygame.draw.line(self.screen, PURPLE, (start_x, start_y), (end_x, end_y), 2)
+            lines.append(((start_x, start_y), (end_x, end_y)))
+        
+        xs = [x for line in lines for x, _ in line]
+        ys = [y for line in lines for _, y in line]
+        left, top = min(xs) - 2, min(ys) - 2
+        overlay = pygame.Surface((max(xs) - left + 3, max(ys) - top + 3), pygame.SRCALPHA).convert_alpha()
+        overlay.fill((0, 0, 0, 0))
+        for (start_x, start_y), (end_x, end_y) in lines:
+            pygame.draw.line(overlay, PURPLE, (start_x - left, start_y - top), (end_x - left, end_y - top), 2)
+        return overlay, (left, top)
     
-    def draw_settings(self):
-        """Draw the settings screen"""
+    def render_settings_static(self):
+        """Title and option labels of the settings screen, everything but the buttons"""
+        static = pygame.Surface((WIDTH, HEIGHT)).convert()
+        static.fill(WHITE)
+        
         # Draw title
-        title_text = title_font.render("Game Settings", True, BLACK)
+        title_text = render_text(title_font, "Game Settings")
         title_rect = title_text.get_rect(center=(WIDTH//2, 80))
-        self.screen.blit(title_text, title_rect)
+        static.blit(title_text, title_rect)
         
-        # Draw settings options
+        # Draw settings option labels
         option_y = 180
+        static.blit(render_text(font, f"Animation Speed: {self.animation_speed}ms"), (WIDTH//4, option_y))
+        option_y += 80
+        static.blit(render_text(font, "Show Path Preview:"), (WIDTH//4, option_y))
+        option_y += 80
+        static.blit(render_text(font, "Challenge Interval:"), (WIDTH//4, option_y))
+        option_y += 80
+        # Path search: exact A* or weighted A* for faster, possibly longer paths
+        static.blit(render_text(font, "Path Search:"), (WIDTH//4, option_y))
+        return static
+    
+    def draw_settings(self):
+        """Draw the settings screen"""
+        buttons = self.settings_buttons
         
-        # Animation speed setting
-        speed_text = font.render(f"Animation Speed: {self.animation_speed}ms", True, BLACK)
-        self.screen.blit(speed_text, (WIDTH//4, option_y))
-        
-        speed_faster = Button(WIDTH//2, option_y, 100, 40, "Faster", GREEN)
-        speed_slower = Button(WIDTH//2 + 110, option_y, 100, 40, "Slower", RED)
-        
-        speed_faster.draw(self.screen)
-        speed_slower.draw(self.screen)
+        # The labels only change with the animation speed; rebuild them then and on entry
+        if self.full_redraw or self.settings_static_speed != self.animation_speed:
+            self.settings_static = self.render_settings_static()
+            self.settings_static_speed = self.animation_speed
+            self.full_redraw = True
+        self.screen.blit(self.settings_static, (0, 0))
         
-        if pygame.mouse.get_pressed()[0]:
-            pos = pygame.mouse.get_pos()
-            if speed_faster.is_clicked(pos):
+        if self.mouse_clicked:
+            if buttons['speed_faster'].is_clicked(self.mouse_pos):
                 self.animation_speed = max(100, self.animation_speed - 50)
-            elif speed_slower.is_clicked(pos):
+            elif buttons['speed_slower'].is_clicked(self.mouse_pos):
                 self.animation_speed = min(1000, self.animation_speed + 50)
         
-        option_y += 80
-        
         # Path preview toggle
-        preview_text = font.render("Show Path Preview:", True, BLACK)
-        self.screen.blit(preview_text, (WIDTH//4, option_y))
-        
-        preview_on = Button(WIDTH//2, option_y, 100, 40, "On", GREEN if self.show_path_preview else GRAY)
-        preview_off = Button(WIDTH//2 + 110, option_y, 100, 40, "Off", RED if not self.show_path_preview else GRAY)
-        
-        preview_on.draw(self.screen)
-        preview_off.draw(self.screen)
-        
-        if pygame.mouse.get_pressed()[0]:
-            pos = pygame.mouse.get_pos()
-            if preview_on.is_clicked(pos):
-                self.show_path_preview = True
-            elif preview_off.is_clicked(pos):
-                self.show_path_preview = False
-        
-        option_y += 80
+        if self.mouse_clicked:
+            for key in ('preview_on', 'preview_off'):
+                if buttons[key].is_clicked(self.mouse_pos):
+                    self.show_path_preview = buttons[key].action
         
         # Challenge mode difficulty
-        challenge_text = font.render("Challenge Interval:", True, BLACK)
-        self.screen.blit(challenge_text, (WIDTH//4, option_y))
-        
-        interval_easy = Button(WIDTH//2 - 120, option_y, 100, 40, "Easy", GREEN if self.challenge_interval == 20000 else GRAY)
-        interval_medium = Button(WIDTH//2, option_y, 100, 40, "Medium", GREEN if self.challenge_interval == 10000 else GRAY)
-        interval_hard = Button(WIDTH//2 + 120, option_y, 100, 40, "Hard", GREEN if self.challenge_interval == 5000 else GRAY)
-        
-        interval_easy.draw(self.screen)
-        interval_medium.draw(self.screen)
-        interval_hard.draw(self.screen)
-        
-        if pygame.mouse.get_pressed()[0]:
-            pos = pygame.mouse.get_pos()
-            if interval_easy.is_clicked(pos):
-                self.challenge_interval = 20000  # 20 seconds
-            elif interval_medium.is_clicked(pos):
-                self.challenge_interval = 10000  # 10 seconds
-            elif interval_hard.is_clicked(pos):
-                self.challenge_interval = 5000   # 5 seconds
-        
-        # Back button
-        back_button = Button(WIDTH//2 - 100, HEIGHT - 80, 200, 50, "Back", RED, MAIN_MENU)
-        back_button.draw(self.screen)
-        
-        if pygame.mouse.get_pressed()[0] and back_button.is_clicked(pygame.mouse.get_pos()):
+        if self.mouse_clicked:
+            for key in ('interval_easy', 'interval_medium', 'interval_hard'):
+                if buttons[key].is_clicked(self.mouse_pos):
+                    self.challenge_interval = buttons[key].action
+        
+        # Path search weight
+        if self.mouse_clicked:
+            for key in ('search_exact', 'search_fast', 'search_greedy'):
+                weight = buttons[key].action
+                if buttons[key].is_clicked(self.mouse_pos) and self.heuristic_weight != weight:
+                    self.heuristic_weight = weight
+                    stats_data["heuristic_weight"] = weight
+                    mark_stats_dirty()
+        
+        # Reflect the current selections; a no-op unless something changed
+        buttons['preview_on'].set_color(GREEN if self.show_path_preview else GRAY)
+        buttons['preview_off'].set_color(RED if not self.show_path_preview else GRAY)
+        for key in ('interval_easy', 'interval_medium', 'interval_hard'):
+            buttons[key].set_color(GREEN if self.challenge_interval == buttons[key].action else GRAY)
+        for key in ('search_exact', 'search_fast', 'search_greedy'):
+            buttons[key].set_color(GREEN if self.heuristic_weight == buttons[key].action else GRAY)
+        
+        draw_buttons(self.screen, buttons.values(), self.mouse_pos)
+        self.dirty_rects.extend(button.rect for button in buttons.values())
+        
+        if self.mouse_clicked and buttons['back'].is_clicked(self.mouse_pos):
             self.game_state = MAIN_MENU
     
-    def draw_stats(self):
-        """Draw the statistics screen"""
+    def render_stats_static(self):
+        """Everything on the statistics screen except the back button"""
+        static = pygame.Surface((WIDTH, HEIGHT)).convert()
+        static.fill(WHITE)
+        
         # Draw title
-        title_text = title_font.render("Game Statistics", True, BLACK)
+        title_text = render_text(title_font, "Game Statistics")
         title_rect = title_text.get_rect(center=(WIDTH//2, 50))
-        self.screen.blit(title_text, title_rect)
+        static.blit(title_text, title_rect)
         
         stats_y = 120
         
@@ -1494,37 +1961,41 @@ class GameManager:
             f"Gold Collected: {stats_data['gold_collected']}",
             f"Total Steps: {stats_data['total_steps']}",
             f"Deaths: {stats_data['deaths']}",
-            f"Best Path Length: {stats_data['best_path_length'] if stats_data['best_path_length'] != float('inf') else 'N/A'}",
+            f"Best Path Length: {'N/A' if stats_data['best_path_length'] is None else stats_data['best_path_length']}",
             f"Best Score: {stats_data['best_score']}"
         ]
         
-        # Draw left column - global stats
-        for stat in global_stats:
-            text = font.render(stat, True, BLACK)
-            self.screen.blit(text, (50, stats_y))
-            stats_y += 40
+        # Draw left column - global stats, recomposed only when a value changed
+        global_key = tuple(global_stats)
+        if global_key != self.global_stats_key:
+            self.global_stats_surface = pygame.Surface((WIDTH // 2, 40 * len(global_stats))).convert()
+            self.global_stats_surface.fill(WHITE)
+            for i, stat in enumerate(global_stats):
+                self.global_stats_surface.blit(render_text(font, stat), (0, i * 40))
+            self.global_stats_key = global_key
+        static.blit(self.global_stats_surface, (50, stats_y))
         
         # Draw right column - level completions
         level_stats_x = WIDTH // 2 + 50
         level_stats_y = 120
         
-        level_title = font.render("Level Completions:", True, BLACK)
-        self.screen.blit(level_title, (level_stats_x, level_stats_y))
+        level_title = render_text(font, "Level Completions:")
+        static.blit(level_title, (level_stats_x, level_stats_y))
         level_stats_y += 40
         
         if stats_data["levels_completed"]:
             for level, count in stats_data["levels_completed"].items():
-                text = small_font.render(f"{level}: {count}", True, BLACK)
-                self.screen.blit(text, (level_stats_x, level_stats_y))
+                text = render_text(small_font, f"{level}: {count}")
+                static.blit(text, (level_stats_x, level_stats_y))
                 level_stats_y += 30
         else:
-            text = small_font.render("No levels completed yet", True, BLACK)
-            self.screen.blit(text, (level_stats_x, level_stats_y))
+            text = render_text(small_font, "No levels completed yet")
+            static.blit(text, (level_stats_x, level_stats_y))
         
         # Draw recent history
         history_y = 350
-        history_title = font.render("Recent Games:", True, BLACK)
-        self.screen.blit(history_title, (50, history_y))
+        history_title = render_text(font, "Recent Games:")
+        static.blit(history_title, (50, history_y))
         history_y += 40
         
         column_headers = ["Date", "Level", "Difficulty", "Steps", "Score", "Time", "Result"]
@@ -1533,92 +2004,125 @@ class GameManager:
         
         # Draw headers
         for header, width in zip(column_headers, column_widths):
-            text = small_font.render(header, True, BLACK)
-            self.screen.blit(text, (column_x, history_y))
+            text = render_text(small_font, header)
+            static.blit(text, (column_x, history_y))
             column_x += width
         
         history_y += 30
         
-        # Draw recent games (last 5)
-        recent_games = stats_data["history"][-5:] if stats_data["history"] else []
+        # Draw recent games (last 5), one cached surface per row; only visible rows are kept
+        recent_games = list(islice(reversed(stats_data["history"]), 5))[::-1]
+        row_cache = {}
         for game in recent_games:
-            column_x = 50
-            for i, key in enumerate(["date", "level", "difficulty", "steps", "score", "time", "result"]):
-                value = str(game.get(key, ""))
-                text = tiny_font.render(value, True, BLACK)
-                self.screen.blit(text, (column_x, history_y))
-                column_x += column_widths[i]
+            values = tuple(str(game.get(key, "")) for key in ("date", "level", "difficulty", "steps", "score", "time", "result"))
+            row = self.history_row_cache.get(values)
+            if row is None:
+                row = pygame.Surface((sum(column_widths), 25)).convert()
+                row.fill(WHITE)
+                column_x = 0
+                for value, width in zip(values, column_widths):
+                    row.blit(render_text(tiny_font, value), (column_x, 0))
+                    column_x += width
+            row_cache[values] = row
+            static.blit(row, (50, history_y))
             history_y += 25
+        self.history_row_cache = row_cache
+        
+        return static
+    
+    def draw_stats(self):
+        """Draw the statistics screen"""
+        # Stats only change while a game runs, so the static part is rebuilt on entry
+        if self.full_redraw or self.stats_static is None:
+            self.stats_static = self.render_stats_static()
+        self.screen.blit(self.stats_static, (0, 0))
         
         # Draw back button
-        self.stats_back_button.draw(self.screen)
+        self.stats_back_button.draw(self.screen, self.mouse_pos)
+        self.dirty_rects.append(self.stats_back_button.rect)
         
-        if pygame.mouse.get_pressed()[0] and self.stats_back_button.is_clicked(pygame.mouse.get_pos()):
+        if self.mouse_clicked and self.stats_back_button.is_clicked(self.mouse_pos):
             self.game_state = MAIN_MENU
     
     def draw_grid(self, offset_x, offset_y, tile_size):
         """Draw the game grid with all entities"""
-        if not self.grid:
+        if self.grid is None:
             return
         
-        for row in range(len(self.grid)):
-            for col in range(len(self.grid[row])):
-                # Calculate tile position
-                x = offset_x + col * tile_size
-                y = offset_y + row * tile_size
-                
-                # Draw tile background
-                pygame.draw.rect(self.screen, WHITE, (x, y, tile_size, tile_size))
-                pygame.draw.rect(self.screen, BLACK, (x, y, tile_size, tile_size), 1)
-                
-                # Draw entity based on grid value
-                entity = self.grid[row][col]
-                
-                if entity == AGENT:
-                    pygame.draw.circle(self.screen, BLUE, (x + tile_size//2, y + tile_size//2), tile_size//3)
-                
-                elif entity == GOLD:
-                    pygame.draw.circle(self.screen, GREEN, (x + tile_size//2, y + tile_size//2), tile_size//3)
-                    
-                    # Draw dollar sign
-                    dollar_text = font.render("$", True, BLACK)
-                    dollar_rect = dollar_text.get_rect(center=(x + tile_size//2, y + tile_size//2))
-                    self.screen.blit(dollar_text, dollar_rect)
-                
-                elif entity == WUMPUS:
-                    # Draw wumpus as a red triangle
-                    pygame.draw.polygon(self.screen, RED, [
-                        (x + tile_size//2, y + tile_size//5),
-                        (x + tile_size//5, y + tile_size*4//5),
-                        (x + tile_size*4//5, y + tile_size*4//5)
-                    ])
-                
-                elif entity == PIT:
-                    # Draw pit as a black circle
-                    pygame.draw.circle(self.screen, BLACK, (x + tile_size//2, y + tile_size//2), tile_size//3)
-                
-                elif entity == OBSTACLE:
-                    # Draw obstacle as a brown rectangle
-                    pygame.draw.rect(self.screen, BROWN, (x + tile_size//5, y + tile_size//5, 
-                                                       tile_size*3//5, tile_size*3//5))
-                
-                elif entity == TRAP:
-                    # Draw trap as an orange X
-                    pygame.draw.line(self.screen, ORANGE, (x + tile_size//5, y + tile_size//5), 
-                                   (x + tile_size*4//5, y + tile_size*4//5), tile_size//10)
-                    pygame.draw.line(self.screen, ORANGE, (x + tile_size*4//5, y + tile_size//5), 
-                                   (x + tile_size//5, y + tile_size*4//5), tile_size//10)
-                
-                elif entity == TELEPORT:
-                    # Draw teleport as a purple circle
-                    pygame.draw.circle(self.screen, PURPLE, (x + tile_size//2, y + tile_size//2), tile_size//3, 5)
-                    
-                    # Draw inner circle
-                    pygame.draw.circle(self.screen, PURPLE, (x + tile_size//2, y + tile_size//2), tile_size//6)
-                
-                elif entity == TRAIL:
-                    # Draw trail as a light blue dot
-                    pygame.draw.circle(self.screen, LIGHT_BLUE, (x + tile_size//2, y + tile_size//2), tile_size//6)
+        if self.grid_background is None or self.grid_background_tile_size != tile_size:
+            self.grid_background = self.render_grid_background(tile_size)
+            self.grid_background_tile_size = tile_size
+        self.screen.blit(self.grid_background, (offset_x, offset_y))
+        
+        # The agent moves every step, so it is drawn over the cached tiles. agent_pos
+        # tracks it without scanning the grid; the scan is only a fallback for grids
+        # where it went stale (e.g. the agent painted over in the editor)
+        atlas, areas = tile_atlas(tile_size)
+        agent_area = areas[AGENT]
+        if self.agent_pos is not None and self.grid[self.agent_pos] == AGENT:
+            agent_cells = (self.agent_pos,)
+        else:
+            agent_cells = np.argwhere(self.grid == AGENT).tolist()
+        self.screen.blits([(atlas, (offset_x + col * tile_size, offset_y + row * tile_size), agent_area)
+                           for row, col in agent_cells], False)
+    
+    def render_legend(self):
+        """Render the sidebar legend once on the sidebar color"""
+        legend_items = [
+            (AGENT, BLUE, "Agent"),
+            (GOLD, GREEN, "Gold"),
+            (WUMPUS, RED, "Wumpus"),
+            (PIT, BLACK, "Pit"),
+            (OBSTACLE, BROWN, "Obstacle"),
+            (TRAP, ORANGE, "Trap"),
+            (TELEPORT, PURPLE, "Teleport")
+        ]
+        legend = pygame.Surface((SIDEBAR_WIDTH, 30 + len(legend_items) * 40)).convert()
+        legend.fill(LIGHT_BLUE)
+        
+        legend_title = font.render("Legend:", True, BLACK)
+        legend.blit(legend_title, (20, 0))
+        legend_y = 30
+        
+        for entity, color, label in legend_items:
+            pygame.draw.rect(legend, color, (20, legend_y, 30, 30))
+            pygame.draw.rect(legend, BLACK, (20, legend_y, 30, 30), 1)
+            text_surface = small_font.render(label, True, BLACK)
+            legend.blit(text_surface, (60, legend_y + 8))
+            legend_y += 40
+        
+        return legend
+    
+    def redraw_background_cells(self, cells):
+        """Repaint the given (row, col) cells on the cached background after they changed"""
+        if self.grid_background is None:
+            return
+        tile_size = self.grid_background_tile_size
+        atlas, areas = tile_atlas(tile_size)
+        empty = areas[EMPTY]
+        blit_sequence = []
+        for row, col in cells:
+            entity = int(self.grid[row, col])
+            blit_sequence.append((atlas, (col * tile_size, row * tile_size),
+                                  areas.get(entity, empty) if entity != AGENT else empty))
+        self.grid_background.blits(blit_sequence, False)
+    
+    def render_grid_background(self, tile_size):
+        """Render every tile except the agent onto one surface"""
+        rows, cols = self.grid.shape
+        background = empty_grid_surface(rows, cols, tile_size).copy()
+        
+        # Only occupied cells need a tile on top of the empty grid; the agent is
+        # left out because draw_grid puts it on top each frame. All tiles come from
+        # one atlas surface, picked by source rect
+        atlas, areas = tile_atlas(tile_size)
+        occupied_rows, occupied_cols = np.nonzero((self.grid != EMPTY) & (self.grid != AGENT))
+        entities = self.grid[occupied_rows, occupied_cols].tolist()
+        positions = np.stack((occupied_cols * tile_size, occupied_rows * tile_size), axis=1).tolist()
+        background.blits([(atlas, position, areas[entity]) for entity, position in zip(entities, positions)
+                          if entity in areas], False)
+        
+        return background
 
 # Run the game
 if __name__ == "__main__":
@@ -3,13 +3,16 @@ import random
 import math
 import os
 import json
+import html
 from collections import deque
-from datetime import datetime
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache, partial
+import numpy as np
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QPushButton, 
-                           QLabel, QVBoxLayout, QHBoxLayout, QGridLayout,
+                           QLabel, QVBoxLayout, QHBoxLayout,
                            QLineEdit, QComboBox, QStackedWidget, QFrame)
-from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush, QPainterPath, QPolygon
-from PyQt6.QtCore import Qt, QRect, QPoint, QTimer, pyqtSignal, QSize
+from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush, QPainterPath, QPolygon, QPixmap
+from PyQt6.QtCore import Qt, QRect, QPoint, QTimer, QElapsedTimer, pyqtSignal, QSize, QPointF, QRectF
 
 # Constants for the game grid
 GRID_SIZE = 10  # 10x10 grid
@@ -26,18 +29,23 @@ GAME_RUNNING = 2
 MAP_EDITOR = 3
 SETTINGS = 4
 STATS = 5
-LEVEL_SELECT = 6
 
-# Entities
-AGENT = "A"
-WUMPUS = "W"
-GOLD = "G"
-PIT = "P"
-EMPTY = "_"
-TRAIL = "T"
-OBSTACLE = "O"
-TRAP = "X"
-TELEPORT = "TP"
+# Entities, stored as small integer codes in uint8 grids
+EMPTY = 0
+AGENT = 1
+WUMPUS = 2
+GOLD = 3
+PIT = 4
+TRAIL = 5
+OBSTACLE = 6
+TRAP = 7
+TELEPORT = 8
+
+# Letters shown on the tiles
+TILE_SYMBOLS = {
+    AGENT: "A", WUMPUS: "W", GOLD: "G", PIT: "P",
+    OBSTACLE: "O", TRAP: "X", TELEPORT: "TP"
+}
 
 # Colors - Convert pygame colors to QColor
 WHITE = QColor(255, 255, 255)
@@ -54,6 +62,81 @@ PURPLE = QColor(128, 0, 128)
 ORANGE = QColor(255, 165, 0)
 BROWN = QColor(139, 69, 19)
 
+# Fonts, shared by every screen instead of being built per label
+TITLE_FONT = QFont("Arial", 36, QFont.Weight.Bold)
+HEADING_FONT = QFont("Arial", 24, QFont.Weight.Bold)
+LABEL_FONT = QFont("Arial", 14)
+BOLD_LABEL_FONT = QFont("Arial", 14, QFont.Weight.Bold)
+MESSAGE_FONT = QFont("Arial", 12)
+
+# Tile background color, indexed by entity code
+TILE_COLORS = (WHITE, BLUE, RED, GREEN, BLACK, LIGHT_BLUE, BROWN, ORANGE, PURPLE)
+TILE_BRUSHES = tuple(QBrush(color) for color in TILE_COLORS)
+TILE_PEN = QPen(BLACK, 1)  # Tile borders and entity letters
+
+# Animation curves sampled once over progress 0..1; Animation.draw indexes them per frame
+EASING_STEPS = 256
+_easing_t = np.linspace(0, 1, EASING_STEPS)
+EASE_OUT_QUAD = (1 - (1 - _easing_t) ** 2).tolist()        # Movement easing
+AGENT_PULSE = np.sin(_easing_t * math.pi).tolist()        # Agent grows and shrinks once
+TRAP_FLASH = np.sin(_easing_t * math.pi * 8).tolist()     # Quick trap flashing
+
+# Pens and brushes used while drawing overlays, built once instead of every frame
+OVERLAY_PEN = QPen(BLACK, 2)
+AGENT_BRUSH = QBrush(BLUE)
+DIRECTION_PEN = QPen(BLACK, 3)
+GOLD_BRUSH = QBrush(GREEN)
+PATH_COLOR = QColor(255, 255, 0, 128)  # Semi-transparent yellow
+PATH_PEN = QPen(PATH_COLOR, 3)
+PATH_BRUSH = QBrush(PATH_COLOR)
+# Trap flash keyframes, one per easing step, fading between red and white
+TRAP_FLASH_BRUSHES = tuple(QBrush(QColor(255, fade, fade)) for fade in
+                           (min(255, max(0, int(255 * (1 - flash)))) for flash in TRAP_FLASH))
+
+# Source size of the pre-rendered gold particle dot
+PARTICLE_DOT_SIZE = 16
+
+@lru_cache(maxsize=None)
+def particle_dot():
+    """Yellow dot that gold particles are stamped from (built once, after the QApplication)."""
+    pixmap = QPixmap(PARTICLE_DOT_SIZE, PARTICLE_DOT_SIZE)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QBrush(YELLOW))
+    painter.drawEllipse(0, 0, PARTICLE_DOT_SIZE, PARTICLE_DOT_SIZE)
+    painter.end()
+    return pixmap
+
+@lru_cache(maxsize=None)
+def ripple_ring(diameter, width, ratio=1.0):
+    """Purple teleport ripple ring, padded by its pen width on every side."""
+    side = diameter + 2 * width
+    pixmap = QPixmap(math.ceil(side * ratio), math.ceil(side * ratio))
+    pixmap.setDevicePixelRatio(ratio)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(QPen(PURPLE, width))
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+    painter.drawEllipse(width, width, diameter, diameter)
+    painter.end()
+    return pixmap
+
+@lru_cache(maxsize=None)
+def tile_glyph(tile_type, ratio=1.0):
+    """Entity letter centred on a transparent tile-sized pixmap."""
+    pixmap = QPixmap(math.ceil(TILE_SIZE * ratio), math.ceil(TILE_SIZE * ratio))
+    pixmap.setDevicePixelRatio(ratio)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(TILE_PEN)
+    painter.drawText(QRect(0, 0, TILE_SIZE, TILE_SIZE), Qt.AlignmentFlag.AlignCenter, TILE_SYMBOLS[tile_type])
+    painter.end()
+    return pixmap
+
 # Difficulty settings
 DIFFICULTY_SETTINGS = {
     "Easy": {"wumpus": 1, "pits": 5, "obstacles": 1, "traps": 0, "teleports": 0},
@@ -62,47 +145,55 @@ DIFFICULTY_SETTINGS = {
     "Expert": {"wumpus": 4, "pits": 12, "obstacles": 7, "traps": 3, "teleports": 2}
 }
 
-# Custom button class with hover effect
-class StyledButton(QPushButton):
-    def __init__(self, text, color, action=None, parent=None):
-        super().__init__(text, parent)
-        self.base_color = QColor(color)
-        self.hover_color = QColor(
-            min(color.red() + 30, 255),
-            min(color.green() + 30, 255),
-            min(color.blue() + 30, 255)
-        )
-        self.setStyleSheet(f"""
+@lru_cache(maxsize=None)
+def button_style_sheet(red, green, blue):
+    """Stylesheet for a StyledButton of the given base color, shared by same-colored buttons"""
+    hover = (min(red + 30, 255), min(green + 30, 255), min(blue + 30, 255))
+    return f"""
             QPushButton {{
-                background-color: rgb({color.red()}, {color.green()}, {color.blue()});
+                background-color: rgb({red}, {green}, {blue});
                 border: 2px solid black;
                 border-radius: 5px;
                 padding: 5px;
                 font-size: 18px;
             }}
             QPushButton:hover {{
-                background-color: rgb({self.hover_color.red()}, {self.hover_color.green()}, {self.hover_color.blue()});
+                background-color: rgb({hover[0]}, {hover[1]}, {hover[2]});
             }}
             QPushButton:pressed {{
-                background-color: rgb({color.red()-20 if color.red()>20 else 0}, 
-                                      {color.green()-20 if color.green()>20 else 0}, 
-                                      {color.blue()-20 if color.blue()>20 else 0});
+                background-color: rgb({red-20 if red>20 else 0}, 
+                                      {green-20 if green>20 else 0}, 
+                                      {blue-20 if blue>20 else 0});
             }}
             QPushButton:disabled {{
                 background-color: rgb(150, 150, 150);
             }}
-        """)
+        """
+
+# Custom button class with hover effect
+class StyledButton(QPushButton):
+    def __init__(self, text, color, action=None, parent=None):
+        super().__init__(text, parent)
+        self.base_color = QColor(color)
+        self.hover_color = QColor(
+            min(color.red() + 30, 255),
+            min(color.green() + 30, 255),
+            min(color.blue() + 30, 255)
+        )
+        self.setStyleSheet(button_style_sheet(color.red(), color.green(), color.blue()))
         self.setMinimumHeight(40)
         self.action = action
         
 class Animation:
     def __init__(self, start_pos, end_pos, duration=300, entity_type=AGENT):
+        self.reset(start_pos, end_pos, duration, entity_type)
+    
+    def reset(self, start_pos, end_pos, duration=300, entity_type=AGENT):
+        """(Re)initialise all animation state, so pooled instances can be reused"""
         self.start_pos = start_pos  # Grid position (row, col)
         self.end_pos = end_pos      # Grid position (row, col)
         self.duration = duration
-        self.start_time = QTimer()
-        self.start_time.start(duration)
-        self.elapsed = 0
+        self.elapsed = 0.0
         self.entity_type = entity_type
         self.completed = False
         
@@ -116,26 +207,29 @@ class Animation:
         self.rotation = 0
         self.scale = 1.0
         self.alpha = 255
-        self.particles = []
+        # Particle state as parallel arrays, one row per live particle
+        self.particle_pos = np.empty((0, 2))
+        self.particle_vel = np.empty((0, 2))
+        self.particle_size = np.empty(0)
+        self.particle_lifetime = np.empty(0)
+        self.particle_elapsed = np.empty(0)
         
         # Special animation for gold collection
         if entity_type == GOLD:
             self.create_particles()
     
     def create_particles(self, count=20):
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 5)
-            size = random.uniform(2, 8)
-            lifetime = random.uniform(500, 1500)
-            self.particles.append({
-                'pos': list(self.start_pixel),
-                'vel': [math.cos(angle) * speed, math.sin(angle) * speed],
-                'size': size,
-                'color': YELLOW,
-                'lifetime': lifetime,
-                'elapsed': 0
-            })
+        # Draw (angle, speed, size, lifetime) per particle, in that order
+        params = np.array([(random.uniform(0, 2 * math.pi), random.uniform(1, 5),
+                            random.uniform(2, 8), random.uniform(500, 1500))
+                           for _ in range(count)]).reshape(count, 4)
+        angle, speed = params[:, 0], params[:, 1]
+        
+        self.particle_pos = np.tile(np.array(self.start_pixel, dtype=float), (count, 1))
+        self.particle_vel = np.column_stack((np.cos(angle) * speed, np.sin(angle) * speed))
+        self.particle_size = params[:, 2]
+        self.particle_lifetime = params[:, 3]
+        self.particle_elapsed = np.zeros(count)
     
     def update(self, delta_time):
         # Update elapsed time
@@ -145,32 +239,36 @@ class Animation:
             self.completed = True
             return True
         
-        # Update particle effects
-        for particle in self.particles:
-            particle['elapsed'] += delta_time
-            if particle['elapsed'] > particle['lifetime']:
-                self.particles.remove(particle)
-                continue
-                
-            # Update particle position
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
+        # Update particle effects, dropping the particles that have burnt out
+        if len(self.particle_elapsed):
+            self.particle_elapsed += delta_time
+            alive = self.particle_elapsed <= self.particle_lifetime
+            if not alive.all():
+                self.particle_pos = self.particle_pos[alive]
+                self.particle_vel = self.particle_vel[alive]
+                self.particle_size = self.particle_size[alive]
+                self.particle_lifetime = self.particle_lifetime[alive]
+                self.particle_elapsed = self.particle_elapsed[alive]
+            
+            # Update particle positions
+            self.particle_pos += self.particle_vel
             
         return False
         
     def draw(self, painter):
         progress = min(self.elapsed / self.duration, 1.0)
+        step = int(progress * (EASING_STEPS - 1) + 0.5)
         
         # Calculate current position with easing
-        eased_progress = self.ease_out_quad(progress)
+        eased_progress = EASE_OUT_QUAD[step]
         current_x = self.start_pixel[0] + (self.end_pixel[0] - self.start_pixel[0]) * eased_progress
         current_y = self.start_pixel[1] + (self.end_pixel[1] - self.start_pixel[1]) * eased_progress
         
         # Draw based on entity type
         if self.entity_type == AGENT:
             # Agent animation - blue circle with smooth movement
-            painter.setBrush(QBrush(BLUE))
-            size = TILE_SIZE // 3 * (1 + 0.2 * math.sin(progress * math.pi))
+            painter.setBrush(AGENT_BRUSH)
+            size = TILE_SIZE // 3 * (1 + 0.2 * AGENT_PULSE[step])
             painter.drawEllipse(int(current_x - size/2), int(current_y - size/2), int(size), int(size))
             
             # Draw a direction indicator
@@ -179,7 +277,7 @@ class Animation:
             if dir_x != 0 or dir_y != 0:
                 norm = math.sqrt(dir_x**2 + dir_y**2)
                 dir_x, dir_y = dir_x/norm, dir_y/norm
-                painter.setPen(QPen(BLACK, 3))
+                painter.setPen(DIRECTION_PEN)
                 painter.drawLine(
                     QPoint(int(current_x), int(current_y)),
                     QPoint(int(current_x + dir_x * TILE_SIZE//4), int(current_y + dir_y * TILE_SIZE//4))
@@ -187,25 +285,21 @@ class Animation:
         
         elif self.entity_type == GOLD:
             # Gold collection animation - particles and a shrinking gold circle
-            # Draw particles
-            for particle in self.particles:
-                painter.setBrush(QBrush(particle['color']))
+            # Draw particles, stamped from the dot pixmap in a single call
+            if len(self.particle_pos):
+                fade_factors = 1 - self.particle_elapsed / self.particle_lifetime
+                scales = self.particle_size.astype(int) / PARTICLE_DOT_SIZE
+                source = QRectF(0, 0, PARTICLE_DOT_SIZE, PARTICLE_DOT_SIZE)
+                fragments = [QPainter.PixmapFragment.create(QPointF(x, y), source, scale, scale, 0, fade_factor)
+                             for (x, y), scale, fade_factor in zip(self.particle_pos.tolist(), scales.tolist(),
+                                                                   fade_factors.tolist())]
                 painter.setPen(Qt.PenStyle.NoPen)
-                fade_factor = 1 - (particle['elapsed'] / particle['lifetime'])
-                color = QColor(particle['color'])
-                color.setAlpha(int(255 * fade_factor))
-                painter.setBrush(QBrush(color))
-                size = int(particle['size'])
-                painter.drawEllipse(
-                    int(particle['pos'][0] - size/2),
-                    int(particle['pos'][1] - size/2),
-                    size, size
-                )
+                painter.drawPixmapFragments(fragments, particle_dot())
             
             # Draw shrinking gold
             if progress < 0.7:  # Only show during first part of animation
                 size_factor = 1 - progress/0.7
-                painter.setBrush(QBrush(GREEN))
+                painter.setBrush(GOLD_BRUSH)
                 painter.setPen(Qt.PenStyle.NoPen)
                 size = int(TILE_SIZE // 3 * size_factor)
                 painter.drawEllipse(
@@ -216,13 +310,7 @@ class Animation:
                 
         elif self.entity_type == TRAP:
             # Trap animation - red flash
-            flash_intensity = math.sin(progress * math.pi * 8)  # Quick flashing
-            flash_color = QColor(
-                255, 
-                max(0, int(255 * (1-flash_intensity))), 
-                max(0, int(255 * (1-flash_intensity)))
-            )
-            painter.setBrush(QBrush(flash_color))
+            painter.setBrush(TRAP_FLASH_BRUSHES[step])
             painter.setPen(Qt.PenStyle.NoPen)
             rect_size = TILE_SIZE // 1.5
             painter.drawRect(
@@ -233,116 +321,95 @@ class Animation:
             )
             
         elif self.entity_type == TELEPORT:
-            # Teleport animation - circular ripple effect
-            painter.setPen(QPen(PURPLE))
-            painter.setBrush(Qt.BrushStyle.NoBrush)
+            # Teleport animation - circular ripple effect, blitted from cached rings
+            ratio = painter.device().devicePixelRatioF()
             for i in range(3):
                 ripple_progress = (progress + i/3) % 1.0
                 radius = TILE_SIZE//2 * ripple_progress
                 width = max(1, int(TILE_SIZE//10 * (1 - ripple_progress)))
-                painter.setPen(QPen(PURPLE, width))
-                painter.drawEllipse(
-                    int(current_x - radius),
-                    int(current_y - radius),
-                    int(radius * 2),
-                    int(radius * 2)
+                painter.drawPixmap(
+                    int(current_x - radius) - width,
+                    int(current_y - radius) - width,
+                    ripple_ring(int(radius * 2), width, ratio)
                 )
+
+class AnimationPool:
+    """Free list of finished animations, handed out again instead of building new ones"""
+    def __init__(self, size=8):
+        self.free = [Animation((0, 0), (0, 0)) for _ in range(size)]
+    
+    def acquire(self, start_pos, end_pos, duration=300, entity_type=AGENT):
+        if not self.free:
+            return Animation(start_pos, end_pos, duration, entity_type)
+        animation = self.free.pop()
+        animation.reset(start_pos, end_pos, duration, entity_type)
+        return animation
     
-    def ease_out_quad(self, x):
-        return 1 - (1 - x) * (1 - x)
+    def release(self, animation):
+        self.free.append(animation)
 
+@dataclass(slots=True, frozen=True)
 class Level:
-    def __init__(self, name, difficulty, size=GRID_SIZE, custom_config=None):
-        self.name = name
-        self.difficulty = difficulty
-        self.size = size
-        
+    name: str
+    difficulty: str
+    size: int = GRID_SIZE
+    custom_config: tuple = ()  # (setting, value) pairs, kept hashable
+    settings: dict = field(init=False, compare=False)
+    agent_pos: tuple = field(init=False, compare=False)
+    gold_pos: tuple = field(init=False, compare=False)
+    
+    def __post_init__(self):
         # Default settings based on difficulty
-        self.settings = DIFFICULTY_SETTINGS[difficulty].copy() if difficulty in DIFFICULTY_SETTINGS else DIFFICULTY_SETTINGS["Medium"].copy()
+        settings = DIFFICULTY_SETTINGS[self.difficulty].copy() if self.difficulty in DIFFICULTY_SETTINGS else DIFFICULTY_SETTINGS["Medium"].copy()
         
         # Custom configuration overrides defaults
-        if custom_config:
-            self.settings.update(custom_config)
+        settings.update(self.custom_config)
+        object.__setattr__(self, "settings", settings)
         
         # Default starting positions
-        self.agent_pos = (0, 0)
-        self.gold_pos = (size-1, size-1)
+        object.__setattr__(self, "agent_pos", (0, 0))
+        object.__setattr__(self, "gold_pos", (self.size-1, self.size-1))
         
     def generate_grid(self):
         """Generate a grid based on level settings"""
-        grid = [[EMPTY for _ in range(self.size)] for _ in range(self.size)]
+        grid = np.zeros((self.size, self.size), dtype=np.uint8)
         
         # Place agent and gold
-        grid[self.agent_pos[0]][self.agent_pos[1]] = AGENT
-        grid[self.gold_pos[0]][self.gold_pos[1]] = GOLD
-        
-        # Place wumpuses
-        wumpus_positions = []
-        for _ in range(self.settings["wumpus"]):
-            pos = self.find_empty_position(grid, [self.agent_pos, self.gold_pos] + wumpus_positions)
-            if pos:
-                wumpus_positions.append(pos)
-                grid[pos[0]][pos[1]] = WUMPUS
-        
-        # Place pits
-        pit_positions = []
-        for _ in range(self.settings["pits"]):
-            pos = self.find_empty_position(grid, [self.agent_pos, self.gold_pos] + wumpus_positions + pit_positions)
-            if pos:
-                pit_positions.append(pos)
-                grid[pos[0]][pos[1]] = PIT
-        
-        # Place obstacles
-        obstacle_positions = []
-        for _ in range(self.settings["obstacles"]):
-            pos = self.find_empty_position(grid, [self.agent_pos, self.gold_pos] + wumpus_positions + pit_positions + obstacle_positions)
-            if pos:
-                obstacle_positions.append(pos)
-                grid[pos[0]][pos[1]] = OBSTACLE
-        
-        # Place traps
-        trap_positions = []
-        for _ in range(self.settings["traps"]):
-            pos = self.find_empty_position(grid, [self.agent_pos, self.gold_pos] + wumpus_positions + pit_positions + obstacle_positions + trap_positions)
-            if pos:
-                trap_positions.append(pos)
-                grid[pos[0]][pos[1]] = TRAP
-        
-        # Place teleports
-        teleport_positions = []
-        for _ in range(self.settings["teleports"]):
-            pos = self.find_empty_position(grid, [self.agent_pos, self.gold_pos] + wumpus_positions + pit_positions + obstacle_positions + trap_positions + teleport_positions)
-            if pos:
-                teleport_positions.append(pos)
-                grid[pos[0]][pos[1]] = TELEPORT
-                
+        grid[self.agent_pos] = AGENT
+        grid[self.gold_pos] = GOLD
+        
+        # Place every entity type in one pass: draw all positions at once from the
+        # empty cells, keeping the agent's neighbourhood free while there is room
+        counts = [(WUMPUS, self.settings["wumpus"]), (PIT, self.settings["pits"]),
+                  (OBSTACLE, self.settings["obstacles"]), (TRAP, self.settings["traps"]),
+                  (TELEPORT, self.settings["teleports"])]
+        total = sum(count for _, count in counts)
+        
+        empty = grid.ravel() == EMPTY
+        rows, cols = np.indices(grid.shape)
+        near_agent = ((np.abs(rows - self.agent_pos[0]) <= 1) & (np.abs(cols - self.agent_pos[1]) <= 1)).ravel()
+        away_cells = np.flatnonzero(empty & ~near_agent)
+        chosen = away_cells[random.sample(range(len(away_cells)), min(total, len(away_cells)))]
+        if len(chosen) < total:
+            # Crowded grid: fall back to the empty cells next to the agent, in order
+            chosen = np.concatenate((chosen, np.flatnonzero(empty & near_agent)[:total - len(chosen)]))
+        
+        placed = {}
+        start = 0
+        for entity, count in counts:
+            cells = chosen[start:start + count]
+            grid.flat[cells] = entity
+            placed[entity] = cells
+            start += count
+        
+        wumpus_positions = [divmod(int(index), self.size) for index in placed[WUMPUS]]
         return grid, self.agent_pos, self.gold_pos, wumpus_positions
-    
-    def find_empty_position(self, grid, exclude_positions):
-        """Find a random empty position that's not in the excluded list"""
-        attempts = 0
-        while attempts < 100:  # Prevent infinite loop
-            row = random.randint(0, self.size-1)
-            col = random.randint(0, self.size-1)
-            
-            if grid[row][col] == EMPTY and (row, col) not in exclude_positions:
-                # Also check that the position isn't adjacent to the agent start
-                if abs(row - self.agent_pos[0]) > 1 or abs(col - self.agent_pos[1]) > 1:
-                    return (row, col)
-            
-            attempts += 1
-        
-        # If we couldn't find a position after many attempts, just find any empty space
-        for row in range(self.size):
-            for col in range(self.size):
-                if grid[row][col] == EMPTY and (row, col) not in exclude_positions:
-                    return (row, col)
-        
-        return None  # Grid is full (shouldn't happen)
 
 # Game grid widget for rendering
 class GameGridWidget(QWidget):
     tileClicked = pyqtSignal(int, int)  # Signal for when a tile is clicked (row, col)
+    animationsStarted = pyqtSignal()    # First animation added to an idle grid
+    animationsFinished = pyqtSignal()   # Last running animation completed or cleared
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -351,26 +418,97 @@ class GameGridWidget(QWidget):
         self.gold_pos = None
         self.path = []
         self.animations = []
+        self.animation_pool = AnimationPool()
         self.teleport_destinations = {}
         self.show_path_preview = True
+        self._bg_pixmap = None  # Tiles pre-rendered by set_grid; paintEvent only blits it
+        self._path_line = QPolygon()         # Path preview through the tile centres, rebuilt by set_path
+        self._path_markers = QPainterPath()  # Node circles of the path preview, rebuilt by set_path
         
         self.setFixedSize(WIDTH, HEIGHT)
+        # paintEvent covers the whole widget with the opaque background, so skip Qt's pre-clear
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
+        self.setAutoFillBackground(False)
     
     def set_grid(self, grid, agent_pos, gold_pos):
         self.grid = grid
         self.agent_pos = agent_pos
         self.gold_pos = gold_pos
+        self.render_background()
         self.update()
     
+    def render_background(self):
+        """Paint every tile once into the cached background pixmap"""
+        ratio = self.devicePixelRatioF()
+        self._bg_pixmap = QPixmap(round(WIDTH * ratio), round(HEIGHT * ratio))
+        self._bg_pixmap.setDevicePixelRatio(ratio)
+        self._bg_pixmap.fill(self.palette().window().color())  # Opaque, for WA_OpaquePaintEvent
+        
+        # Tiles are axis-aligned rects, so the bulk pass is drawn without antialiasing
+        painter = QPainter(self._bg_pixmap)
+        painter.setPen(TILE_PEN)
+        for row, col in np.ndindex(self.grid.shape):
+            self.paint_tile(painter, row, col)
+        painter.end()
+    
+    def redraw_tiles(self, cells):
+        """Repaint the given (row, col) tiles on the cached background after an edit"""
+        if self._bg_pixmap is None:
+            return
+        
+        rows, cols = self.grid.shape
+        dirty = []
+        painter = QPainter(self._bg_pixmap)
+        painter.setPen(TILE_PEN)
+        for row, col in cells:
+            # Tile borders overlap the neighbouring tiles' edge pixels, so clear a one
+            # pixel margin and repaint the neighbours in grid order, as a full rebuild would
+            area = QRect(col * TILE_SIZE - 1, row * TILE_SIZE - 1, TILE_SIZE + 2, TILE_SIZE + 2)
+            painter.setClipRect(area)
+            painter.fillRect(area, self.palette().window())
+            for r in range(max(0, row - 1), min(rows, row + 2)):
+                for c in range(max(0, col - 1), min(cols, col + 2)):
+                    self.paint_tile(painter, r, c)
+            dirty.append(area)
+        painter.end()
+        
+        # Only the repainted tiles need to reach the screen
+        for area in dirty:
+            self.update(area)
+    
+    def set_tile(self, row, col, tile_type):
+        """Change a single tile and repaint just that part of the grid"""
+        self.grid[row, col] = tile_type
+        self.redraw_tiles([(row, col)])
+    
     def set_path(self, path):
         self.path = path
+        centers = [QPoint(col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2) for row, col in path]
+        self._path_line = QPolygon(centers)
+        self._path_markers = QPainterPath()
+        for center in centers:
+            self._path_markers.addEllipse(center.x() - 5, center.y() - 5, 10, 10)
         self.update()
     
     def add_animation(self, animation):
         self.animations.append(animation)
+        if len(self.animations) == 1:
+            self.animationsStarted.emit()
+    
+    def animate(self, start_pos, end_pos, duration=300, entity_type=AGENT):
+        """Start an animation taken from the pool; it goes back when it completes"""
+        animation = self.animation_pool.acquire(start_pos, end_pos, duration, entity_type)
+        self.add_animation(animation)
+        return animation
     
     def clear_animations(self):
+        had_animations = bool(self.animations)
+        for anim in self.animations:
+            self.animation_pool.release(anim)
         self.animations = []
+        if had_animations:
+            self.update()
+            self.animationsFinished.emit()
     
     def update_animations(self, delta_time):
         # Update all animations
@@ -379,13 +517,16 @@ class GameGridWidget(QWidget):
             if anim.update(delta_time):
                 completed.append(anim)
         
-        # Remove completed animations
+        # Remove completed animations and return them to the pool
         for anim in completed:
             self.animations.remove(anim)
+            self.animation_pool.release(anim)
         
-        # Request repaint if any animations are active
-        if self.animations:
+        # Request repaint while animations run, plus once to clear the last frame
+        if self.animations or completed:
             self.update()
+        if completed and not self.animations:
+            self.animationsFinished.emit()
             
         return len(completed) > 0
     
@@ -397,93 +538,47 @@ class GameGridWidget(QWidget):
         col = event.position().x() // TILE_SIZE
         row = event.position().y() // TILE_SIZE
         
-        if 0 <= row < len(self.grid) and 0 <= col < len(self.grid[0]):
+        rows, cols = self.grid.shape
+        if 0 <= row < rows and 0 <= col < cols:
             self.tileClicked.emit(int(row), int(col))
     
+    def paint_tile(self, painter, row, col):
+        """Draw one tile's background, border and entity letter (expects TILE_PEN to be set)"""
+        x = col * TILE_SIZE
+        y = row * TILE_SIZE
+        
+        # Draw tile background
+        tile_type = int(self.grid[row, col])
+        painter.setBrush(TILE_BRUSHES[tile_type])
+        painter.drawRect(x, y, TILE_SIZE, TILE_SIZE)
+        
+        # Draw entity symbols from the pre-rendered glyphs
+        if tile_type in TILE_SYMBOLS:
+            painter.drawPixmap(x, y, tile_glyph(tile_type, painter.device().devicePixelRatioF()))
+    
     def paintEvent(self, event):
-        if self.grid is None:
+        if self.grid is None or self._bg_pixmap is None:
+            # Nothing cached yet; the widget is opaque, so clear it ourselves
+            QPainter(self).fillRect(self.rect(), self.palette().window())
             return
             
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # Draw grid
-        for row in range(len(self.grid)):
-            for col in range(len(self.grid[0])):
-                x = col * TILE_SIZE
-                y = row * TILE_SIZE
-                
-                # Draw tile background
-                tile_type = self.grid[row][col]
-                
-                if tile_type == EMPTY:
-                    painter.setBrush(QBrush(WHITE))
-                elif tile_type == AGENT:
-                    painter.setBrush(QBrush(BLUE))
-                elif tile_type == WUMPUS:
-                    painter.setBrush(QBrush(RED))
-                elif tile_type == GOLD:
-                    painter.setBrush(QBrush(GREEN))
-                elif tile_type == PIT:
-                    painter.setBrush(QBrush(BLACK))
-                elif tile_type == OBSTACLE:
-                    painter.setBrush(QBrush(BROWN))
-                elif tile_type == TRAP:
-                    painter.setBrush(QBrush(ORANGE))
-                elif tile_type == TELEPORT:
-                    painter.setBrush(QBrush(PURPLE))
-                elif tile_type == TRAIL:
-                    painter.setBrush(QBrush(LIGHT_BLUE))
-                
-                painter.setPen(QPen(BLACK, 1))
-                painter.drawRect(x, y, TILE_SIZE, TILE_SIZE)
-                
-                # Draw entity symbols
-                if tile_type != EMPTY:
-                    painter.setPen(QPen(BLACK, 2))
-                    text_rect = QRect(x, y, TILE_SIZE, TILE_SIZE)
-                    
-                    if tile_type == AGENT:
-                        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "A")
-                    elif tile_type == WUMPUS:
-                        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "W")
-                    elif tile_type == GOLD:
-                        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "G")
-                    elif tile_type == PIT:
-                        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "P")
-                    elif tile_type == OBSTACLE:
-                        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "O")
-                    elif tile_type == TRAP:
-                        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "X")
-                    elif tile_type == TELEPORT:
-                        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "TP")
+        # Tiles come from the cached background; overlays start from the symbol pen
+        # the tile pass used to leave set
+        painter.drawPixmap(0, 0, self._bg_pixmap)
+        painter.setPen(OVERLAY_PEN)
         
         # Draw path preview if enabled
         if self.show_path_preview and self.path:
-            path_color = QColor(255, 255, 0, 128)  # Semi-transparent yellow
-            painter.setPen(QPen(path_color, 3))
+            painter.setPen(PATH_PEN)
+            if len(self.path) > 1:
+                painter.drawPolyline(self._path_line)
             
-            for i in range(len(self.path) - 1):
-                start_row, start_col = self.path[i]
-                end_row, end_col = self.path[i + 1]
-                
-                start_x = start_col * TILE_SIZE + TILE_SIZE // 2
-                start_y = start_row * TILE_SIZE + TILE_SIZE // 2
-                end_x = end_col * TILE_SIZE + TILE_SIZE // 2
-                end_y = end_row * TILE_SIZE + TILE_SIZE // 2
-                
-                painter.drawLine(start_x, start_y, end_x, end_y)
-                
-                # Draw a small circle at each path point
-                painter.setBrush(QBrush(path_color))
-                painter.drawEllipse(start_x - 5, start_y - 5, 10, 10)
-            
-            # Draw last point
-            if self.path:
-                last_row, last_col = self.path[-1]
-                last_x = last_col * TILE_SIZE + TILE_SIZE // 2
-                last_y = last_row * TILE_SIZE + TILE_SIZE // 2
-                painter.drawEllipse(last_x - 5, last_y - 5, 10, 10)
+            # Draw a small circle at each path point, all in one path
+            painter.setBrush(PATH_BRUSH)
+            painter.drawPath(self._path_markers)
         
         # Draw animations on top
         for animation in self.animations:
@@ -499,7 +594,7 @@ class MainMenuScreen(QWidget):
         
         # Title
         title = QLabel("Wumpus AI Game")
-        title.setFont(QFont("Arial", 36, QFont.Weight.Bold))
+        title.setFont(TITLE_FONT)
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title)
         layout.addSpacing(30)
@@ -531,7 +626,7 @@ class LevelSelectScreen(QWidget):
         
         # Title
         title = QLabel("Select Level")
-        title.setFont(QFont("Arial", 36, QFont.Weight.Bold))
+        title.setFont(TITLE_FONT)
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title)
         layout.addSpacing(30)
@@ -566,6 +661,8 @@ class GameScreen(QWidget):
         
         # Game grid widget
         self.gridWidget = GameGridWidget()
+        self.gridWidget.animationsStarted.connect(self.start_animation_timer)
+        self.gridWidget.animationsFinished.connect(self.stop_animation_timer)
         layout.addWidget(self.gridWidget)
         
         # Sidebar
@@ -580,7 +677,7 @@ class GameScreen(QWidget):
         self.timeLabel = QLabel("Time: 00:00")
         
         for label in [self.levelLabel, self.scoreLabel, self.stepsLabel, self.timeLabel]:
-            label.setFont(QFont("Arial", 14))
+            label.setFont(LABEL_FONT)
             sidebar_layout.addWidget(label)
         
         sidebar_layout.addSpacing(20)
@@ -599,7 +696,7 @@ class GameScreen(QWidget):
         # Game message box
         self.messageBox = QLabel("Find the gold while avoiding dangers!")
         self.messageBox.setWordWrap(True)
-        self.messageBox.setFont(QFont("Arial", 12))
+        self.messageBox.setFont(MESSAGE_FONT)
         self.messageBox.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.messageBox.setFrameShape(QFrame.Shape.Box)
         self.messageBox.setFrameShadow(QFrame.Shadow.Sunken)
@@ -612,23 +709,23 @@ class GameScreen(QWidget):
         
         self.setLayout(layout)
         
-        # Animation timer
+        # Animation timer, only running while the grid has animations to advance
         self.animationTimer = QTimer()
         self.animationTimer.setInterval(16)  # ~60 fps
         self.animationTimer.timeout.connect(self.update_animations)
-        self.last_update_time = datetime.now()
+        self.animationClock = QElapsedTimer()
+        self.animationClock.start()
         
     def start_animation_timer(self):
-        self.last_update_time = datetime.now()
-        self.animationTimer.start()
+        if not self.animationTimer.isActive():
+            self.animationClock.restart()
+            self.animationTimer.start()
     
     def stop_animation_timer(self):
         self.animationTimer.stop()
     
     def update_animations(self):
-        current_time = datetime.now()
-        delta_time = (current_time - self.last_update_time).total_seconds() * 1000  # Convert to ms
-        self.last_update_time = current_time
+        delta_time = self.animationClock.restart()  # Monotonic ms since the last frame
         
         # Update animations in the grid widget
         self.gridWidget.update_animations(delta_time)
@@ -644,13 +741,13 @@ class MapEditorScreen(QWidget):
         title_layout = QVBoxLayout()
         
         title = QLabel("Map Editor")
-        title.setFont(QFont("Arial", 24, QFont.Weight.Bold))
+        title.setFont(HEADING_FONT)
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         title_layout.addWidget(title)
         
         self.message_box = QLabel("Create your own Wumpus World!")
         self.message_box.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.message_box.setFont(QFont("Arial", 14))
+        self.message_box.setFont(LABEL_FONT)
         title_layout.addWidget(self.message_box)
         
         layout.addLayout(title_layout)
@@ -668,7 +765,7 @@ class MapEditorScreen(QWidget):
         palette_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         
         palette_title = QLabel("Tile Types")
-        palette_title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        palette_title.setFont(BOLD_LABEL_FONT)
         palette_layout.addWidget(palette_title)
         
         # Create palette buttons
@@ -720,12 +817,13 @@ class MapEditorScreen(QWidget):
         self.initialize_map()
     
     def initialize_map(self):
-        self.grid = [[EMPTY for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.uint8)
         self.agent_pos = (0, 0)
         self.gold_pos = (GRID_SIZE-1, GRID_SIZE-1)
-        self.grid[0][0] = AGENT
-        self.grid[GRID_SIZE-1][GRID_SIZE-1] = GOLD
+        self.grid[self.agent_pos] = AGENT
+        self.grid[self.gold_pos] = GOLD
         self.teleport_destinations = {}
+        self.teleport_positions = set()  # Teleport tiles on the grid, kept in step by handle_tile_click
         self.gridWidget.set_grid(self.grid, self.agent_pos, self.gold_pos)
     
     def set_selected_tile(self):
@@ -752,45 +850,39 @@ class MapEditorScreen(QWidget):
 
     def handle_tile_click(self, row, col):
         # Don't allow placing teleports without destinations
-        if self.selected_tile == TELEPORT and not any(self.grid[r][c] == TELEPORT for r in range(len(self.grid)) for c in range(len(self.grid[0]))):
+        if self.selected_tile == TELEPORT and not self.teleport_positions:
             self.teleport_destinations[(row, col)] = None  # Mark as needing a destination
 
         # Special case for teleports - link them in pairs
-        elif self.selected_tile == TELEPORT and any(self.grid[r][c] == TELEPORT for r in range(len(self.grid)) for c in range(len(self.grid[0]))):
-            # If this is the second teleport, link it with the first one
-            first_teleport = None
-            for r in range(len(self.grid)):
-                for c in range(len(self.grid[0])):
-                    if self.grid[r][c] == TELEPORT:
-                        first_teleport = (r, c)
-                        break
-                if first_teleport:
-                    break
-                    
-            if first_teleport and first_teleport != (row, col):
+        elif self.selected_tile == TELEPORT and self.teleport_positions:
+            # If this is the second teleport, link it with the first one (in grid order)
+            first_teleport = min(self.teleport_positions)
+            if first_teleport != (row, col):
                 self.teleport_destinations[first_teleport] = (row, col)
                 self.teleport_destinations[(row, col)] = first_teleport
         
         # Handle agent and gold placement (only one of each allowed)
+        # agent_pos and gold_pos always name the one tile that can hold each
         if self.selected_tile == AGENT:
-            # Remove existing agent
-            for r in range(len(self.grid)):
-                for c in range(len(self.grid[0])):
-                    if self.grid[r][c] == AGENT:
-                        self.grid[r][c] = EMPTY
+            # Remove existing agent, unless another tile was already painted over it
+            if self.grid[self.agent_pos] == AGENT:
+                self.gridWidget.set_tile(*self.agent_pos, EMPTY)
             self.agent_pos = (row, col)
             
         elif self.selected_tile == GOLD:
-            # Remove existing gold
-            for r in range(len(self.grid)):
-                for c in range(len(self.grid[0])):
-                    if self.grid[r][c] == GOLD:
-                        self.grid[r][c] = EMPTY
+            # Remove existing gold, unless another tile was already painted over it
+            if self.grid[self.gold_pos] == GOLD:
+                self.gridWidget.set_tile(*self.gold_pos, EMPTY)
             self.gold_pos = (row, col)
             
         # Set the tile
-        self.grid[row][col] = self.selected_tile
-        self.gridWidget.set_grid(self.grid, self.agent_pos, self.gold_pos)
+        if self.selected_tile == TELEPORT:
+            self.teleport_positions.add((row, col))
+        else:
+            self.teleport_positions.discard((row, col))
+        self.gridWidget.agent_pos = self.agent_pos
+        self.gridWidget.gold_pos = self.gold_pos
+        self.gridWidget.set_tile(row, col, self.selected_tile)
 
 # Settings screen
 class SettingsScreen(QWidget):
@@ -801,7 +893,7 @@ class SettingsScreen(QWidget):
         
         # Title
         title = QLabel("Settings")
-        title.setFont(QFont("Arial", 36, QFont.Weight.Bold))
+        title.setFont(TITLE_FONT)
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title)
         layout.addSpacing(30)
@@ -813,7 +905,7 @@ class SettingsScreen(QWidget):
         # Animation speed
         anim_layout = QHBoxLayout()
         anim_label = QLabel("Animation Speed:")
-        anim_label.setFont(QFont("Arial", 14))
+        anim_label.setFont(LABEL_FONT)
         self.animationSpeedCombo = QComboBox()
         self.animationSpeedCombo.addItems(["Slow", "Medium", "Fast", "Instant"])
         self.animationSpeedCombo.setCurrentText("Medium")
@@ -824,7 +916,7 @@ class SettingsScreen(QWidget):
         # Sound effects
         sound_layout = QHBoxLayout()
         sound_label = QLabel("Sound Effects:")
-        sound_label.setFont(QFont("Arial", 14))
+        sound_label.setFont(LABEL_FONT)
         self.soundCheckBox = QPushButton("Enabled")
         self.soundCheckBox.setCheckable(True)
         self.soundCheckBox.setChecked(True)
@@ -836,7 +928,7 @@ class SettingsScreen(QWidget):
         # Path preview
         path_layout = QHBoxLayout()
         path_label = QLabel("Show Path Preview:")
-        path_label.setFont(QFont("Arial", 14))
+        path_label.setFont(LABEL_FONT)
         self.pathPreviewCheckBox = QPushButton("Enabled")
         self.pathPreviewCheckBox.setCheckable(True)
         self.pathPreviewCheckBox.setChecked(True)
@@ -879,7 +971,7 @@ class StatsScreen(QWidget):
         
         # Title
         title = QLabel("Game Statistics")
-        title.setFont(QFont("Arial", 36, QFont.Weight.Bold))
+        title.setFont(TITLE_FONT)
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title)
         layout.addSpacing(30)
@@ -898,25 +990,13 @@ class StatsScreen(QWidget):
             "Gold Collected": 10
         }
         
-        # Stats grid
-        stats_layout = QGridLayout()
-        stats_layout.setSpacing(15)
-        
-        row = 0
-        for key, value in self.stats.items():
-            label = QLabel(f"{key}:")
-            label.setFont(QFont("Arial", 14))
-            
-            value_label = QLabel(str(value))
-            value_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
-            
-            stats_layout.addWidget(label, row, 0, Qt.AlignmentFlag.AlignRight)
-            stats_layout.addWidget(value_label, row, 1, Qt.AlignmentFlag.AlignLeft)
-            row += 1
-        
-        stats_widget = QWidget()
-        stats_widget.setLayout(stats_layout)
-        layout.addWidget(stats_widget)
+        # Stats table - one rich-text label instead of a label pair per stat
+        self.statsLabel = QLabel()
+        self.statsLabel.setFont(LABEL_FONT)
+        self.statsLabel.setTextFormat(Qt.TextFormat.RichText)
+        self.statsLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.refresh()
+        layout.addWidget(self.statsLabel)
         layout.addSpacing(40)
         
         # Reset and back buttons
@@ -928,6 +1008,14 @@ class StatsScreen(QWidget):
         layout.addLayout(buttons_layout)
         
         self.setLayout(layout)
+    
+    def refresh(self):
+        """Show the current values of self.stats in the stats table"""
+        rows = "".join(
+            f'<tr><td align="right">{html.escape(key)}:</td><td><b>{html.escape(str(value))}</b></td></tr>'
+            for key, value in self.stats.items()
+        )
+        self.statsLabel.setText(f'<table cellspacing="0" cellpadding="8">{rows}</table>')
 
 
     
@@ -953,6 +1041,10 @@ class WumpusGameApp(QMainWindow):
         
         # Current game instance
         self.current_game = None
+        
+        # Path preview setting as last saved, so grid clicks don't query the settings widgets
+        # (starts enabled, like the settings toggle)
+        self.path_preview_enabled = True
     
     def create_levels(self):
         """Create predefined levels"""
@@ -962,12 +1054,17 @@ class WumpusGameApp(QMainWindow):
             Level("Cave", "Medium"),
             Level("Dungeon", "Medium"),
             Level("Abyss", "Hard"),
-            Level("Labyrinth", "Hard", custom_config={"obstacles": 10}),
+            Level("Labyrinth", "Hard", custom_config=(("obstacles", 10),)),
             Level("The Void", "Expert")
         ]
+        self.level_to_idx = {level: i for i, level in enumerate(self.levels)}
+    
+    # Screens built on first visit, by stack index
+    LAZY_SCREENS = {GAME_RUNNING: "game_screen", MAP_EDITOR: "map_editor",
+                    SETTINGS: "settings_screen", STATS: "stats_screen"}
     
     def create_screens(self):
-        """Create all the screens"""
+        """Create the menu screens; the rest are built when first shown"""
         # Main menu
         self.main_menu = MainMenuScreen()
         self.stack.addWidget(self.main_menu)
@@ -976,56 +1073,75 @@ class WumpusGameApp(QMainWindow):
         self.level_select = LevelSelectScreen(self.levels)
         self.stack.addWidget(self.level_select)
         
-        # Game screen
-        self.game_screen = GameScreen()
-        self.stack.addWidget(self.game_screen)
-        
-        # Map editor
-        self.map_editor = MapEditorScreen()
-        self.stack.addWidget(self.map_editor)
+        # Placeholders reserve the stack indexes of the lazily built screens
+        for index in sorted(self.LAZY_SCREENS):
+            self.stack.addWidget(QWidget())
         
-        # Settings
-        self.settings_screen = SettingsScreen()
-        self.stack.addWidget(self.settings_screen)
-        
-        # Statistics
-        self.stats_screen = StatsScreen()
-        self.stack.addWidget(self.stats_screen)
+        # Screens are never removed from the stack, so these indexes stay valid
+        for screen, index in ((self.main_menu, MAIN_MENU), (self.level_select, LEVEL_SELECT)):
+            assert self.stack.indexOf(screen) == index
+    
+    def install_screen(self, index, screen):
+        """Put a newly built screen in place of the placeholder at its stack index"""
+        placeholder = self.stack.widget(index)
+        self.stack.insertWidget(index, screen)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        assert self.stack.indexOf(screen) == index
+        return screen
+    
+    def show_screen(self, index):
+        """Switch to a screen, building it first if it has not been shown yet"""
+        if index in self.LAZY_SCREENS:
+            getattr(self, self.LAZY_SCREENS[index])
+        self.stack.setCurrentIndex(index)
+    
+    @cached_property
+    def game_screen(self):
+        screen = self.install_screen(GAME_RUNNING, GameScreen())
+        screen.pauseButton.clicked.connect(self.toggle_pause_game)
+        screen.restartButton.clicked.connect(self.restart_game)
+        screen.menuButton.clicked.connect(partial(self.stack.setCurrentIndex, MAIN_MENU))
+        screen.gridWidget.tileClicked.connect(self.handle_game_tile_click)
+        return screen
+    
+    @cached_property
+    def map_editor(self):
+        screen = self.install_screen(MAP_EDITOR, MapEditorScreen())
+        screen.clearButton.clicked.connect(screen.initialize_map)
+        screen.saveButton.clicked.connect(self.save_map)
+        screen.loadButton.clicked.connect(self.load_map)
+        screen.testPathButton.clicked.connect(self.test_path)
+        screen.backButton.clicked.connect(partial(self.stack.setCurrentIndex, MAIN_MENU))
+        return screen
+    
+    @cached_property
+    def settings_screen(self):
+        screen = self.install_screen(SETTINGS, SettingsScreen())
+        screen.saveButton.clicked.connect(self.save_settings)
+        screen.backButton.clicked.connect(partial(self.stack.setCurrentIndex, MAIN_MENU))
+        return screen
+    
+    @cached_property
+    def stats_screen(self):
+        screen = self.install_screen(STATS, StatsScreen())
+        screen.resetButton.clicked.connect(self.reset_stats)
+        screen.backButton.clicked.connect(partial(self.stack.setCurrentIndex, MAIN_MENU))
+        return screen
     
     def setup_connections(self):
-        """Connect signals and slots"""
+        """Connect signals and slots of the menu screens"""
         # Main menu buttons
-        self.main_menu.playButton.clicked.connect(lambda: self.stack.setCurrentIndex(LEVEL_SELECT))
-        self.main_menu.mapEditorButton.clicked.connect(lambda: self.stack.setCurrentIndex(MAP_EDITOR))
-        self.main_menu.statsButton.clicked.connect(lambda: self.stack.setCurrentIndex(STATS))
-        self.main_menu.settingsButton.clicked.connect(lambda: self.stack.setCurrentIndex(SETTINGS))
+        self.main_menu.playButton.clicked.connect(partial(self.show_screen, LEVEL_SELECT))
+        self.main_menu.mapEditorButton.clicked.connect(partial(self.show_screen, MAP_EDITOR))
+        self.main_menu.statsButton.clicked.connect(partial(self.show_screen, STATS))
+        self.main_menu.settingsButton.clicked.connect(partial(self.show_screen, SETTINGS))
         self.main_menu.quitButton.clicked.connect(self.close)
         
         # Level select buttons
         for i, button in enumerate(self.level_select.level_buttons):
-            button.clicked.connect(lambda checked, level_idx=i: self.start_game_with_level(level_idx))
-        self.level_select.backButton.clicked.connect(lambda: self.stack.setCurrentIndex(MAIN_MENU))
-        
-        # Game screen buttons
-        self.game_screen.pauseButton.clicked.connect(self.toggle_pause_game)
-        self.game_screen.restartButton.clicked.connect(self.restart_game)
-        self.game_screen.menuButton.clicked.connect(lambda: self.stack.setCurrentIndex(MAIN_MENU))
-        self.game_screen.gridWidget.tileClicked.connect(self.handle_game_tile_click)
-        
-        # Map editor buttons
-        self.map_editor.clearButton.clicked.connect(self.map_editor.initialize_map)
-        self.map_editor.saveButton.clicked.connect(self.save_map)
-        self.map_editor.loadButton.clicked.connect(self.load_map)
-        self.map_editor.testPathButton.clicked.connect(self.test_path)
-        self.map_editor.backButton.clicked.connect(lambda: self.stack.setCurrentIndex(MAIN_MENU))
-        
-        # Settings screen
-        self.settings_screen.saveButton.clicked.connect(self.save_settings)
-        self.settings_screen.backButton.clicked.connect(lambda: self.stack.setCurrentIndex(MAIN_MENU))
-        
-        # Stats screen
-        self.stats_screen.resetButton.clicked.connect(self.reset_stats)
-        self.stats_screen.backButton.clicked.connect(lambda: self.stack.setCurrentIndex(MAIN_MENU))
+            button.clicked.connect(partial(self.start_game_with_level, i))
+        self.level_select.backButton.clicked.connect(partial(self.stack.setCurrentIndex, MAIN_MENU))
     
     def start_game_with_level(self, level_idx):
         """Start a new game with the selected level"""
@@ -1042,13 +1158,13 @@ class WumpusGameApp(QMainWindow):
     def restart_game(self):
         """Restart the current game"""
         if self.current_game and hasattr(self.current_game, 'level'):
-            self.start_game_with_level(self.levels.index(self.current_game.level))
+            self.start_game_with_level(self.level_to_idx[self.current_game.level])
     
     def handle_game_tile_click(self, row, col):
         """Handle a click on the game grid"""
         if self.current_game:
             # Show path preview
-            if self.settings_screen.pathPreviewCheckBox.isChecked():
+            if self.path_preview_enabled:
                 path = self.current_game.show_path(row, col)
                 if path and len(path) > 1:  # If valid path with at least one move
                     target_row, target_col = path[1]  # First step in path
@@ -1084,6 +1200,7 @@ class WumpusGameApp(QMainWindow):
         
         # Path preview
         path_preview = self.settings_screen.pathPreviewCheckBox.isChecked()
+        self.path_preview_enabled = path_preview
         
         # Apply settings to game
         if self.current_game:
@@ -1106,12 +1223,7 @@ class WumpusGameApp(QMainWindow):
             "Pits Avoided": 0,
             "Gold Collected": 0
         }
-        # Recreate the stats screen
-        self.stack.removeWidget(self.stats_screen)
-        self.stats_screen = StatsScreen()
-        self.stack.addWidget(self.stats_screen)
-        self.stats_screen.backButton.clicked.connect(lambda: self.stack.setCurrentIndex(MAIN_MENU))
-        self.stats_screen.resetButton.clicked.connect(self.reset_stats)
+        self.stats_screen.refresh()
 
 # Main entry point
 if __name__ == "__main__":